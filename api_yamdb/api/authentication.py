@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from reviews.models import User
+
+
+ROLE_CLAIM = 'role'
+ROLE_STATE_KEY = 'auth:role:{}'
+DELETED = 'deleted'
+# Кеши, которые не видны другим процессам: изменение прав, записанное
+# в них, пропустят остальные воркеры.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def get_revocation_cache():
+    return caches[settings.AUTH_REVOCATION_CACHE_ALIAS]
+
+
+def revocations_are_shared():
+    """Видят ли все процессы записи об изменении прав пользователей."""
+
+    return not isinstance(get_revocation_cache(), PROCESS_LOCAL_CACHES)
+
+
+def role_state(role, is_superuser, is_active=True):
+    return (role, bool(is_superuser), bool(is_active))
+
+
+def remember_role_state(user, deleted=False):
+    """Запоминает актуальные права пользователя на время жизни токенов."""
+
+    state = DELETED if deleted else role_state(
+        user.role, user.is_superuser, user.is_active
+    )
+    get_revocation_cache().set(
+        ROLE_STATE_KEY.format(user.pk),
+        state,
+        settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()
+    )
+
+
+def remember_role_states(user_ids):
+    """Запоминает права пользователей после массового изменения."""
+
+    users = {user.pk: user for user in User.objects.filter(pk__in=user_ids)}
+    for user_id in user_ids:
+        if user_id in users:
+            remember_role_state(users[user_id])
+        else:
+            remember_role_state(User(pk=user_id), deleted=True)
+
+
+def request_author(user):
+    """Автор новой записи для пользователя запроса без запроса к БД.
+
+    Пользователь из токена заменяется несохранённым `User` с id и именем
+    из утверждений: этого хватает и для внешнего ключа, и для имени
+    автора в ответе.
+    """
+
+    if isinstance(user, User):
+        return user
+    return User(pk=user.pk, username=user.username)
+
+
+class RoleRefreshToken(RefreshToken):
+    """Токен с именем и ролью пользователя в утверждениях."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token[ROLE_CLAIM] = user.role
+        token['is_superuser'] = user.is_superuser
+        return token
+
+
+class RoleTokenUser(TokenUser):
+    """Пользователь, восстановленный из утверждений токена без запроса к БД."""
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_admin(self):
+        return self.role == User.ADMIN or self.is_superuser
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+    @property
+    def is_user(self):
+        return self.role == User.USER
+
+    @property
+    def role_state(self):
+        return role_state(self.role, self.is_superuser)
+
+
+class StatelessRoleAuthentication(JWTAuthentication):
+    """Аутентификация по JWT без загрузки пользователя из БД.
+
+    Если права пользователя изменились после выдачи токена, об этом
+    сообщает запись в кеше `settings.AUTH_REVOCATION_CACHE_ALIAS`, и
+    пользователь загружается из БД как обычно. Токены без утверждения
+    о роли тоже проверяются по БД. Если этот кеш виден только текущему
+    процессу, пользователь всегда загружается из БД, как в
+    `JWTAuthentication`.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token or not revocations_are_shared():
+            return super().get_user(validated_token)
+        user = RoleTokenUser(validated_token)
+        state = get_revocation_cache().get(ROLE_STATE_KEY.format(user.pk))
+        if state is not None and state != user.role_state:
+            return super().get_user(validated_token)
+        return user
@@ -0,0 +1,56 @@
+import hashlib
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Subquery
+
+from reviews.models import DataVersion
+
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def shared_version(name):
+    """Подзапросы с номером и временем изменения общей версии `name`."""
+
+    rows = DataVersion.objects.filter(name=name)
+    return Subquery(rows.values('version')), Subquery(rows.values('changed'))
+
+
+def latest_change(queryset):
+    """Подзапрос с самым поздним `updated` среди строк `queryset`.
+
+    Берётся первая строка индекса по `updated`, а не MAX по всем строкам.
+    """
+
+    return Subquery(queryset.order_by('-updated').values('updated')[:1])
+
+
+def fingerprint(*parts):
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def normalize_query(query_params):
+    return tuple(sorted(
+        (key, tuple(sorted(values)))
+        for key, values in query_params.lists()
+    ))
+
+
+def record(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def response_cache_stats():
+    """Счётчики попаданий и промахов кеша ответов в текущем процессе."""
+
+    with _stats_lock:
+        return {'hits': _stats['hits'], 'misses': _stats['misses']}
@@ -0,0 +1,78 @@
+import json
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+
+def table_estimate(cursor, vendor, table):
+    """Число строк таблицы по статистике планировщика или None."""
+
+    if vendor == 'postgresql':
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [table]
+        )
+        row = cursor.fetchone()
+        # До первого ANALYZE reltuples равен -1 или 0.
+        return int(row[0]) if row and row[0] > 0 else None
+    if vendor == 'sqlite':
+        # Таблица sqlite_stat1 появляется после ANALYZE; первое число
+        # в stat — количество строк таблицы.
+        cursor.execute(
+            'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table]
+        )
+        row = cursor.fetchone()
+        return int(row[0].split()[0]) if row else None
+    return None
+
+
+def query_estimate(cursor, vendor, queryset):
+    """Оценка числа строк отфильтрованного запроса по плану PostgreSQL."""
+
+    if vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def planner_estimate(queryset):
+    connection = connections[queryset.db]
+    try:
+        # Точка сохранения не даёт ошибке запроса прервать транзакцию.
+        with transaction.atomic(using=queryset.db):
+            with connection.cursor() as cursor:
+                if not queryset.query.where:
+                    return table_estimate(
+                        cursor, connection.vendor,
+                        queryset.model._meta.db_table
+                    )
+                return query_estimate(cursor, connection.vendor, queryset)
+    except DatabaseError:
+        return None
+
+
+def estimate_count(queryset, view=None):
+    """Количество объектов для пагинации и признак того, что оно примерное.
+
+    Сначала используется счётчик, который поддерживает само приложение
+    (метод `get_counter_total` представления). Затем статистика
+    планировщика: если она не меньше `API_ESTIMATED_COUNT_THRESHOLD`,
+    возвращается оценка. Иначе выполняется обычный COUNT(*).
+    """
+
+    get_counter_total = getattr(view, 'get_counter_total', None)
+    if get_counter_total is not None:
+        total = get_counter_total()
+        if total is not None:
+            return total, False
+    estimate = planner_estimate(queryset)
+    if (
+        estimate is not None
+        and estimate >= settings.API_ESTIMATED_COUNT_THRESHOLD
+    ):
+        return estimate, True
+    return queryset.count(), False
@@ -0,0 +1,173 @@
+import csv
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound, ValidationError
+
+from reviews.csv_import import chunked
+from reviews.models import Comment, GenreTitle, Review, Title
+from .filters import TitleFilter
+
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+CONTENT_TYPES = {
+    NDJSON: 'application/x-ndjson; charset=utf-8',
+    CSV: 'text/csv; charset=utf-8',
+}
+
+TITLE_FIELDS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('year', 'year'),
+    ('description', 'description'),
+    ('category', 'category__slug'),
+    ('rating', 'rating'),
+)
+REVIEW_FIELDS = (
+    ('id', 'id'),
+    ('title', 'title_id'),
+    ('author', 'author__username'),
+    ('text', 'text'),
+    ('score', 'score'),
+    ('pub_date', 'pub_date'),
+)
+COMMENT_FIELDS = (
+    ('id', 'id'),
+    ('title', 'review__title_id'),
+    ('review', 'review_id'),
+    ('author', 'author__username'),
+    ('text', 'text'),
+    ('pub_date', 'pub_date'),
+)
+
+
+def value_batches(queryset, fields, chunk_size):
+    """Читает строки курсором на стороне БД и отдаёт их пачками.
+
+    В памяти одновременно находится не больше `chunk_size` строк.
+    """
+
+    rows = (
+        queryset
+        .order_by('id')
+        .values_list(*(lookup for _, lookup in fields))
+        .iterator(chunk_size=chunk_size)
+    )
+    names = [name for name, _ in fields]
+    for batch in chunked(rows, chunk_size):
+        yield [dict(zip(names, row)) for row in batch]
+
+
+def title_batches(titles, chunk_size):
+    for batch in value_batches(titles, TITLE_FIELDS, chunk_size):
+        # prefetch_related с iterator() не работает, поэтому жанры
+        # загружаются одним запросом на пачку.
+        genres = defaultdict(list)
+        for title_id, slug in (
+            GenreTitle.objects
+            .filter(title_id__in=[row['id'] for row in batch])
+            .order_by('genre__slug')
+            .values_list('title_id', 'genre__slug')
+        ):
+            genres[title_id].append(slug)
+        for row in batch:
+            row['genre'] = genres[row['id']]
+            if row['rating'] is not None:
+                # Рейтинг отдаётся целым числом, как в GetTitleSerializer.
+                row['rating'] = int(row['rating'])
+        yield batch
+
+
+def review_batches(titles, chunk_size):
+    reviews = Review.objects.all()
+    if titles is not None:
+        reviews = reviews.filter(title_id__in=titles.values('id'))
+    return value_batches(reviews, REVIEW_FIELDS, chunk_size)
+
+
+def comment_batches(titles, chunk_size):
+    comments = Comment.objects.all()
+    if titles is not None:
+        comments = comments.filter(review__title_id__in=titles.values('id'))
+    return value_batches(comments, COMMENT_FIELDS, chunk_size)
+
+
+RESOURCES = {
+    'titles': (
+        title_batches, [name for name, _ in TITLE_FIELDS] + ['genre']
+    ),
+    'reviews': (review_batches, [name for name, _ in REVIEW_FIELDS]),
+    'comments': (comment_batches, [name for name, _ in COMMENT_FIELDS]),
+}
+
+
+def encode_ndjson(batches, columns):
+    for batch in batches:
+        yield ''.join(
+            json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+            for row in batch
+        )
+
+
+class Echo:
+    """Буфер для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def encode_csv(batches, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for batch in batches:
+        yield ''.join(
+            writer.writerow([
+                ','.join(row[column]) if isinstance(row[column], list)
+                else row[column]
+                for column in columns
+            ])
+            for row in batch
+        )
+
+
+ENCODERS = {NDJSON: encode_ndjson, CSV: encode_csv}
+
+
+def filtered_titles(request):
+    """Произведения с фильтрами `TitleFilter` или None без фильтров."""
+
+    filterset = TitleFilter(
+        request.query_params, queryset=Title.objects.all(), request=request
+    )
+    if not any(
+        request.query_params.get(name) for name in filterset.filters
+    ):
+        return None
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    return filterset.qs.order_by()
+
+
+def export_response(request, resource, fmt):
+    """Потоковая выгрузка ресурса целиком в формате NDJSON или CSV."""
+
+    if resource not in RESOURCES or fmt not in ENCODERS:
+        raise NotFound()
+    batches, columns = RESOURCES[resource]
+    titles = filtered_titles(request)
+    if resource == 'titles' and titles is None:
+        titles = Title.objects.all()
+    response = StreamingHttpResponse(
+        ENCODERS[fmt](
+            batches(titles, settings.EXPORT_CHUNK_SIZE), columns
+        ),
+        content_type=CONTENT_TYPES[fmt],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{resource}.{fmt}"'
+    )
+    return response
@@ -1,28 +1,78 @@
 from django_filters import rest_framework
+from rest_framework import filters
 
-from reviews.models import Title
+from reviews.models import GenreTitle, Title
+from reviews.search import search_titles
+
+
+class TitleOrderingFilter(filters.OrderingFilter):
+    """Сортировка произведений с добавлением id для стабильного порядка.
+
+    Каждому полю сортировки соответствует составной индекс (поле, id),
+    поэтому сортировка не требует полного перебора таблицы.
+    """
+
+    relevance_param = 'search'
+
+    def get_ordering(self, request, queryset, view):
+        if (
+            request.query_params.get(self.relevance_param)
+            and not request.query_params.get(self.ordering_param)
+        ):
+            # Результаты поиска уже отсортированы по релевантности.
+            return None
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        last = ordering[-1]
+        return [*ordering, '-id' if last.startswith('-') else 'id']
+
+
+class CharInFilter(rest_framework.BaseInFilter, rest_framework.CharFilter):
+    """Фильтр по списку значений через запятую: `?genre=drama,comedy`."""
 
 
 class TitleFilter(rest_framework.FilterSet):
     """Фильтр для произведений по имени, категории, жанру и году."""
 
+    search = rest_framework.CharFilter(method='filter_search')
     name = rest_framework.CharFilter(
         field_name='name',
         lookup_expr='icontains'
     )
-    category = rest_framework.CharFilter(
+    category = CharInFilter(
         field_name='category__slug',
-        lookup_expr='icontains'
+        lookup_expr='in'
     )
-    genre = rest_framework.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
+    genre = CharInFilter(method='filter_genre')
+    year = rest_framework.NumberFilter(
+        field_name='year',
+        lookup_expr='exact'
     )
-    year = rest_framework.CharFilter(
+    year_min = rest_framework.NumberFilter(
         field_name='year',
-        lookup_expr='icontains'
+        lookup_expr='gte'
+    )
+    year_max = rest_framework.NumberFilter(
+        field_name='year',
+        lookup_expr='lte'
     )
 
     class Meta:
         model = Title
-        fields = ['name', 'category', 'genre', 'year']
+        fields = [
+            'search', 'name', 'category', 'genre', 'year', 'year_min',
+            'year_max'
+        ]
+
+    def filter_genre(self, queryset, name, value):
+        # Подзапрос по связям вместо JOIN не размножает строки
+        # произведений с несколькими подходящими жанрами.
+        return queryset.filter(
+            id__in=GenreTitle.objects.filter(
+                genre__slug__in=value
+            ).values('title_id')
+        )
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -1,5 +1,18 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework import filters, mixins, viewsets
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from .cache import fingerprint, get_cache, normalize_query, record
+from .pagination import LimitPageNumberPagination
+from .read_serializers import fast_read_serializer
+from .serializers import EXPAND_PARAM, FIELDS_PARAM, query_list
 
 
 class ListCreateDestroyViewSet(
@@ -13,4 +26,267 @@ class ListCreateDestroyViewSet(
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
-    pagination_class = PageNumberPagination
+    pagination_class = LimitPageNumberPagination
+
+
+class NestedResourceMixin:
+    """Родительский объект вложенного ресурса, один запрос к БД на запрос.
+
+    Родитель ищется по полям `parent_lookup` (поле модели -> параметр
+    URL) и запоминается в представлении, которое создаётся заново для
+    каждого запроса. Если `parent_exists_only` включён, `check_parent`
+    только проверяет существование родителя через `.exists()`, не
+    загружая его. Строка версий ресурса (`VersionedResourceMixin`)
+    находится только вместе с родителем, поэтому после неё родитель
+    отдельно не проверяется.
+    """
+
+    parent_model = None
+    parent_lookup = {}
+    parent_exists_only = False
+
+    def get_parent_queryset(self):
+        return self.parent_model.objects.filter(**{
+            field: self.kwargs[kwarg]
+            for field, kwarg in self.parent_lookup.items()
+        })
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(self.get_parent_queryset())
+        return self._parent
+
+    def check_parent(self):
+        if hasattr(self, '_parent'):
+            return
+        if not self.parent_exists_only:
+            self.get_parent()
+            return
+        if not hasattr(self, '_parent_exists'):
+            self._parent_exists = (
+                getattr(self, '_resource_versions', None) is not None
+                or self.get_parent_queryset().exists()
+            )
+        if not self._parent_exists:
+            raise Http404
+
+
+class FastReadMixin:
+    """Быстрый сериализатор для GET-запросов.
+
+    GET-запросы сериализуются `read_serializer_class`. Если включён
+    `fast_read`, вместо него используется заранее разобранный
+    `FastReadSerializer` с тем же ответом. Запросы с `?fields=` или
+    `?expand=` по-прежнему обрабатывает сериализатор DRF.
+
+    При включённом `read_values` список выбирается через `.values()`
+    только нужных колонок, а связанные поля вроде `author__username`
+    приходят одним JOIN: объекты моделей не создаются вовсе. Выборка
+    до `.values()` сохраняется в `count_queryset`, и пагинация считает
+    объекты по ней, без JOIN.
+    """
+
+    read_serializer_class = None
+    fast_read = True
+    read_values = False
+
+    def get_serializer_class(self):
+        if self.request.method != 'GET' or self.read_serializer_class is None:
+            return super().get_serializer_class()
+        if not self.is_fast_read():
+            return self.read_serializer_class
+        return (
+            self.get_values_serializer_class()
+            or fast_read_serializer(self.read_serializer_class)
+        )
+
+    def is_fast_read(self):
+        return self.fast_read and not any(
+            param in self.request.query_params
+            for param in (FIELDS_PARAM, EXPAND_PARAM)
+        )
+
+    def get_values_serializer_class(self):
+        if not self.read_values or self.action != 'list':
+            return None
+        return fast_read_serializer(self.read_serializer_class, True)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if getattr(serializer_class, 'from_values', False):
+            self.count_queryset = queryset
+            return queryset.values(*serializer_class.plan.lookups)
+        return queryset
+
+
+class SparseQuerysetMixin:
+    """Выборка только тех колонок и связей, которые попадут в ответ.
+
+    Если в `?fields=` не указано поле модели, оно откладывается через
+    `.defer()`, а для непрошенных связей не выполняются `select_related`
+    и `prefetch_related`.
+    """
+
+    def filter_queryset(self, queryset):
+        return self.sparse_queryset(super().filter_queryset(queryset))
+
+    def sparse_queryset(self, queryset):
+        requested = query_list(self.request, FIELDS_PARAM)
+        if not requested:
+            return queryset
+        fields = self.get_serializer_class()().fields
+        if not fields.keys() & set(requested):
+            return queryset
+        deferred, relations = [], set()
+        for name, field in fields.items():
+            model_field = self.get_model_field(queryset.model, field)
+            if name in requested or model_field is None:
+                continue
+            if model_field.is_relation:
+                relations.add(model_field.name)
+            if model_field.concrete and not model_field.many_to_many:
+                deferred.append(model_field.name)
+        return without_relations(queryset, relations).defer(*deferred)
+
+    def get_model_field(self, model, field):
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        return None if model_field.primary_key else model_field
+
+
+def without_relations(queryset, relations):
+    """Убирает из выборки select_related и prefetch_related связей."""
+
+    if not relations:
+        return queryset
+    prefetches = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if str(lookup).split('__')[0] not in relations
+    ]
+    selected = queryset.query.select_related
+    queryset = queryset.prefetch_related(None).prefetch_related(*prefetches)
+    if isinstance(selected, dict):
+        queryset = queryset.select_related(None).select_related(*(
+            lookup for lookup in selected if lookup not in relations
+        ))
+    return queryset
+
+
+class VersionedResourceMixin:
+    """Версии данных, из которых строится ответ представления.
+
+    `get_version_queryset` возвращает `values_list` с одной строкой:
+    временем `updated` объекта или родителя, последним `updated`
+    вложенных объектов и общими версиями из `DataVersion`. Если строки
+    нет, то объекта или родителя нет: валидаторы не вычисляются, ответ
+    не кешируется, а 404 отдаёт само представление. Версии обновляют
+    триггеры БД из `reviews.versions`.
+    """
+
+    def get_version_queryset(self):
+        raise NotImplementedError
+
+    def get_resource_versions(self):
+        if not hasattr(self, '_resource_versions'):
+            try:
+                rows = list(self.get_version_queryset().order_by()[:1])
+            except (TypeError, ValueError):
+                rows = []
+            self._resource_versions = rows[0] if rows else None
+        return self._resource_versions
+
+    def get_last_modified(self):
+        changes = [
+            value for value in self.get_resource_versions()
+            if isinstance(value, datetime)
+        ]
+        return int(max(changes).timestamp()) if changes else None
+
+    def get_resource_fingerprint(self):
+        return fingerprint(
+            self.basename,
+            self.action,
+            sorted(self.kwargs.items()),
+            normalize_query(self.request.query_params),
+            self.request.META.get('HTTP_ACCEPT', ''),
+            self.get_resource_versions(),
+        )
+
+
+class CachedResponseMixin(VersionedResourceMixin):
+    """Кеширует ответы list и retrieve до изменения данных ресурса.
+
+    Версии ресурса входят в ключ кеша, поэтому после изменения данных
+    устаревшие ответы просто перестают запрашиваться.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if self.get_resource_versions() is None:
+            response = handler(request, *args, **kwargs)
+            response['X-Cache'] = 'MISS'
+            return response
+        cache = get_cache()
+        key = f'response:{self.get_resource_fingerprint()}'
+        data = cache.get(key)
+        if data is not None:
+            record('hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        record('misses')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class ConditionalListMixin(VersionedResourceMixin):
+    """Поддержка ETag и Last-Modified для списка объектов.
+
+    Валидаторы вычисляются по версиям ресурса одним запросом по
+    индексам, поэтому ответ 304 отдаётся до выборки и сериализации
+    данных.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if self.get_resource_versions() is None:
+            return handler(request, *args, **kwargs)
+        etag = quote_etag(self.get_resource_fingerprint())
+        last_modified = self.get_last_modified()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Поддержка ETag и Last-Modified для списка и отдельного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
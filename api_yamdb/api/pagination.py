@@ -0,0 +1,195 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (CursorPagination, DjangoPaginator,
+                                       PageNumberPagination)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counts import estimate_count
+
+EXACT = 'exact'
+ESTIMATE = 'estimate'
+SKIP = 'false'
+
+
+def positive_int(value, cutoff):
+    number = int(value)
+    if number < 1:
+        raise ValueError(value)
+    return min(number, cutoff)
+
+
+class LimitPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация с размером страницы от клиента.
+
+    Размер страницы задаётся параметром `?page_size=` или `?limit=`
+    и ограничивается сверху. Значения по умолчанию и ограничение
+    берутся из атрибутов `page_size` и `max_page_size` представления,
+    а без них из настроек.
+
+    Параметр `?count=` (по умолчанию `API_COUNT_MODE`) задаёт подсчёт
+    общего количества объектов. `exact` — обычный COUNT(*). `estimate` —
+    оценка из счётчиков или статистики БД, в ответе добавляется признак
+    `count_estimated`. `false` — без подсчёта: выбирается на одну строку
+    больше страницы, чтобы узнать, есть ли следующая. Если у
+    представления есть `count_queryset`, объекты считаются по нему,
+    а не по выборке страницы.
+    """
+
+    page_size_query_param = 'page_size'
+    limit_query_param = 'limit'
+    count_query_param = 'count'
+
+    def get_page_size(self, request):
+        view = getattr(self, 'view', None)
+        default = getattr(view, 'page_size', None) or self.page_size
+        maximum = (
+            getattr(view, 'max_page_size', None)
+            or settings.API_MAX_PAGE_SIZE
+        )
+        for param in (self.page_size_query_param, self.limit_query_param):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    return positive_int(value, maximum)
+                except ValueError:
+                    pass
+        return min(default, maximum)
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == '0':
+            return SKIP
+        if mode in (EXACT, ESTIMATE, SKIP):
+            return mode
+        return settings.API_COUNT_MODE
+
+    def django_paginator_class(self, queryset, page_size):
+        paginator = DjangoPaginator(queryset, page_size)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        self.count_mode = self.get_count_mode(request)
+        self.without_count = self.count_mode == SKIP
+        self.known_count = None
+        count_queryset = getattr(view, 'count_queryset', None)
+        if self.count_mode == ESTIMATE:
+            self.known_count, self.count_estimated = estimate_count(
+                queryset if count_queryset is None else count_queryset, view
+            )
+        elif self.count_mode == EXACT and count_queryset is not None:
+            self.known_count = count_queryset.count()
+        if not self.without_count:
+            return super().paginate_queryset(queryset, request, view)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        try:
+            self.page_number = positive_int(
+                request.query_params.get(self.page_query_param, 1),
+                float('inf')
+            )
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message='Неверный номер страницы.'
+            ))
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=self.page_number,
+                message='Страница не содержит результатов.'
+            ))
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.count_mode == ESTIMATE:
+            response = super().get_paginated_response(data)
+            response.data['count_estimated'] = self.count_estimated
+            return response
+        if not self.without_count:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.without_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.page_number + 1
+        )
+
+    def get_previous_link(self):
+        if not self.without_count:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Курсорная пагинация по дате публикации и id."""
+
+    ordering = ('pub_date', 'id')
+
+
+class OptionalCursorPagination(LimitPageNumberPagination):
+    """Постраничная пагинация с курсорным режимом по запросу клиента.
+
+    Курсорный режим включается параметром `?pagination=cursor` и не
+    выполняет ни COUNT(*), ни OFFSET: каждая следующая страница выбирается
+    по индексу, начиная с позиции из курсора.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = PubDateCursorPagination
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.view = view
+            self.cursor_paginator = self.cursor_pagination_class()
+            self.cursor_paginator.page_size = self.get_page_size(request)
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
@@ -0,0 +1,240 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+# Поля, у которых to_representation сводится к приведению типа.
+CONVERTERS = {
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.CharField: str,
+    serializers.SlugField: str,
+    serializers.EmailField: str,
+}
+
+# Виды шагов плана: значение, список значений, вложенный план, список
+# вложенных планов и дата со временем.
+VALUE, MANY, NESTED, MANY_NESTED, DATETIME = range(5)
+
+
+def iso_datetime(value, current_timezone):
+    """То же, что `DateTimeField.to_representation` в формате ISO 8601."""
+
+    if value.tzinfo is current_timezone:
+        # Даты из БД уже в часовом поясе ответа, обычно это UTC.
+        pass
+    elif timezone.is_aware(value):
+        value = value.astimezone(current_timezone)
+    else:
+        value = timezone.make_aware(value, current_timezone)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        return value[:-6] + 'Z'
+    return value
+
+
+def is_iso_datetime(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    return (
+        type(field) is serializers.DateTimeField
+        and settings.USE_TZ
+        and not hasattr(field, 'timezone')
+        and isinstance(output_format, str)
+        and output_format.lower() == ISO_8601
+    )
+
+
+class ReadPlan:
+    """Заранее разобранный сериализатор только для чтения.
+
+    Поля сериализатора DRF разбираются один раз: для каждого выходного
+    поля запоминаются путь к значению и функция преобразования. Затем
+    строки превращаются в словари без создания полей и без проверок
+    DRF на каждую строку. Результат совпадает с `serializer.data`.
+    Текущий часовой пояс для дат определяется один раз на весь ответ.
+
+    Если все поля сводятся к колонкам модели и её связей «к одному»,
+    план умеет строить ответ и из строк `.values(*plan.lookups)`:
+    например, автор отзыва берётся из `author__username` одним JOIN.
+    """
+
+    def __init__(self, serializer_class):
+        fields = serializer_class().fields
+        self.steps = [
+            self.compile(name, field) for name, field in fields.items()
+        ]
+        model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+        self.values_steps = self.compile_values(model, fields)
+
+    @property
+    def lookups(self):
+        return [lookup for _, lookup, _, _ in self.values_steps]
+
+    def compile(self, name, field):
+        attrs = field.source_attrs
+        if isinstance(field, serializers.ListSerializer):
+            return name, attrs, MANY_NESTED, ReadPlan(
+                type(field.child)
+            ).to_dict
+        if isinstance(field, serializers.BaseSerializer):
+            return name, attrs, NESTED, ReadPlan(type(field)).to_dict
+        if isinstance(field, serializers.ManyRelatedField):
+            return name, attrs, MANY, self.related(field.child_relation)
+        if isinstance(field, serializers.RelatedField):
+            return name, attrs, VALUE, self.related(field)
+        if is_iso_datetime(field):
+            return name, attrs, DATETIME, iso_datetime
+        return name, attrs, VALUE, CONVERTERS.get(
+            type(field), field.to_representation
+        )
+
+    def compile_values(self, model, fields):
+        if model is None:
+            return None
+        values_steps = []
+        for (name, attrs, kind, convert), field in zip(
+            self.steps, fields.values()
+        ):
+            lookup = '__'.join(attrs)
+            if isinstance(field, serializers.SlugRelatedField):
+                lookup = f'{lookup}__{field.slug_field}'
+                convert = None
+            elif kind not in (VALUE, DATETIME) or isinstance(
+                field, serializers.RelatedField
+            ):
+                return None
+            if not attrs or not is_column(model, lookup):
+                return None
+            values_steps.append((name, lookup, kind, convert))
+        return values_steps
+
+    def related(self, field):
+        if isinstance(field, serializers.SlugRelatedField):
+            slug_field = field.slug_field
+            return lambda instance: getattr(instance, slug_field)
+        return field.to_representation
+
+    def to_dict(self, instance, current_timezone):
+        data = {}
+        for name, attrs, kind, convert in self.steps:
+            value = instance
+            if kind == MANY or kind == MANY_NESTED:
+                value = related_items(instance, attrs)
+            else:
+                for attr in attrs:
+                    value = getattr(value, attr)
+                    if value is None:
+                        break
+            if value is None:
+                data[name] = None
+            elif kind == VALUE:
+                data[name] = convert(value)
+            elif kind == MANY:
+                data[name] = [convert(item) for item in value]
+            elif kind == MANY_NESTED:
+                data[name] = [
+                    convert(item, current_timezone) for item in value
+                ]
+            else:
+                data[name] = convert(value, current_timezone)
+        return data
+
+    def values_to_dict(self, row, current_timezone):
+        data = {}
+        for name, lookup, kind, convert in self.values_steps:
+            value = row[lookup]
+            if value is None or convert is None:
+                data[name] = value
+            elif kind == VALUE:
+                data[name] = convert(value)
+            else:
+                data[name] = convert(value, current_timezone)
+        return data
+
+
+def is_column(model, lookup):
+    """Ведёт ли путь `lookup` к колонке через связи «к одному»."""
+
+    *relations, name = lookup.split('__')
+    try:
+        for relation in relations:
+            field = model._meta.get_field(relation)
+            if not (field.many_to_one or field.one_to_one):
+                return False
+            model = field.related_model
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return field.concrete and not field.many_to_many
+
+
+def related_items(instance, attrs):
+    """Объекты связи «ко многим», по возможности из кэша prefetch_related.
+
+    Если связь уже загружена через `prefetch_related`, список берётся
+    прямо из кэша модели, без создания менеджера связи на каждую строку.
+    """
+
+    for attr in attrs[:-1]:
+        instance = getattr(instance, attr)
+        if instance is None:
+            return None
+    cache = getattr(instance, '_prefetched_objects_cache', None)
+    if cache and attrs[-1] in cache:
+        return cache[attrs[-1]]
+    return getattr(instance, attrs[-1]).all()
+
+
+class FastReadSerializer:
+    """Сериализатор только для чтения с интерфейсом сериализатора DRF.
+
+    Создаётся функцией `fast_read_serializer` и понимает те же аргументы
+    `instance`, `many` и `context`, что и представления передают
+    сериализаторам. С `from_values` строки — словари из `.values()`.
+    """
+
+    plan = None
+    from_values = False
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @property
+    def data(self):
+        current_timezone = timezone.get_current_timezone()
+        if self.from_values:
+            to_dict = self.plan.values_to_dict
+        else:
+            to_dict = self.plan.to_dict
+        if self.many:
+            return [to_dict(item, current_timezone) for item in self.instance]
+        return to_dict(self.instance, current_timezone)
+
+
+@lru_cache(maxsize=None)
+def fast_read_serializer(serializer_class, from_values=False):
+    """Класс быстрого сериализатора с тем же ответом, что у данного.
+
+    С `from_values=True` класс принимает строки `.values(*plan.lookups)`;
+    если план их не поддерживает, возвращается None.
+    """
+
+    if from_values:
+        plan = fast_read_serializer(serializer_class).plan
+        if plan.values_steps is None:
+            return None
+        suffix = 'Values'
+    else:
+        plan = ReadPlan(serializer_class)
+        suffix = ''
+    return type(
+        f'Fast{serializer_class.__name__}{suffix}',
+        (FastReadSerializer,),
+        {'plan': plan, 'from_values': from_values}
+    )
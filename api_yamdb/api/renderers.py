@@ -0,0 +1,88 @@
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson читает целые длиннее 64 бит как float, а json — как int. Такие
+# числа ищутся как 20 цифр подряд в копии тела, где цифры заменены на 0,
+# а остальные байты на пробелы: это быстрее регулярного выражения.
+DIGITS_ONLY = bytes(
+    ord('0') if ord('0') <= byte <= ord('9') else ord(' ')
+    for byte in range(256)
+)
+LONG_NUMBER = b'0' * 20
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON-рендерер на orjson с тем же результатом, что у JSONRenderer.
+
+    Типы, которые orjson не знает или выводит иначе (даты, Decimal,
+    ленивые строки), передаются кодировщику DRF. Без orjson, с отступами
+    или при нестандартных настройках `COMPACT_JSON`/`UNICODE_JSON`
+    используется обычный JSONRenderer. Отличается только запись чисел
+    с плавающей точкой в экспоненциальной форме (`1e16` вместо `1e+16`)
+    и NaN, которых сериализаторы API не выдают.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None
+            or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            # Например, целые больше 64 бит.
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и JSONRenderer, экранируем разделители строк для JavaScript.
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
+
+
+class FastJSONParser(JSONParser):
+    """JSON-парсер на orjson, совместимый с JSONParser.
+
+    Если orjson не разобрал тело запроса или в нём есть числа, которые
+    orjson читает иначе, его разбирает стандартный json, поэтому
+    принимаются и отклоняются те же запросы, что и раньше.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        body = stream.read()
+        if (
+            codecs.lookup(encoding).name == 'utf-8'
+            and LONG_NUMBER not in body.translate(DIGITS_ONLY)
+        ):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        try:
+            return json.loads(body.decode(encoding), parse_constant=(
+                json.strict_constant if self.strict else None
+            ))
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
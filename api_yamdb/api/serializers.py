@@ -1,6 +1,8 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
 from reviews.models import (Category, Comment, Genre, MAX_RATING, MIN_RATING,
                             Review, Title, User, WRONG_RATING)
@@ -8,6 +10,61 @@ from reviews.models import (Category, Comment, Genre, MAX_RATING, MIN_RATING,
 
 REVIEW_COUNT_ERROR = 'Можно оставить только один отзыв на произведение!'
 
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def query_list(request, param):
+    """Список значений параметра через запятую или None без параметра."""
+
+    if request is None or request.method != 'GET':
+        return None
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class SparseFieldsetMixin:
+    """Выбор полей ответа параметрами `?fields=` и `?expand=`.
+
+    `fields` оставляет в ответе только перечисленные поля. Связи из
+    `Meta.expandable_fields` по умолчанию вложены целиком; если передан
+    `expand`, вложенными остаются только перечисленные в нём, а остальные
+    выводятся своим slug. Параметры действуют только на GET-запросы
+    и только на сериализатор самого ресурса, а не на вложенные.
+    """
+
+    def is_resource_serializer(self):
+        return self.root is self or (
+            self.parent is self.root
+            and isinstance(self.root, serializers.ListSerializer)
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or not self.is_resource_serializer():
+            return fields
+        requested = query_list(request, FIELDS_PARAM)
+        if requested and fields.keys() & set(requested):
+            fields = {
+                name: field for name, field in fields.items()
+                if name in requested
+            }
+        expanded = query_list(request, EXPAND_PARAM)
+        if expanded is not None:
+            for name in getattr(self.Meta, 'expandable_fields', ()):
+                if name in fields and name not in expanded:
+                    fields[name] = serializers.SlugRelatedField(
+                        slug_field='slug',
+                        read_only=True,
+                        many=isinstance(
+                            fields[name], serializers.ListSerializer
+                        )
+                    )
+        return fields
+
 
 class SignUpSerializer(serializers.ModelSerializer):
     """Сериализатор для регистрации  с генерацией кода подтверждения."""
@@ -55,7 +112,7 @@ class MeSerializer(UserSerializer):
     role = serializers.CharField(read_only=True)
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для модели категории с полями имени и slug'а."""
 
     class Meta:
@@ -63,7 +120,7 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для модели жанра с полями имени и slug'а."""
 
     class Meta:
@@ -71,7 +128,7 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class GetTitleSerializer(serializers.ModelSerializer):
+class GetTitleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для модели произведений при GET-запросах."""
 
     genre = GenreSerializer(
@@ -84,12 +141,18 @@ class GetTitleSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(
         read_only=True
     )
+    review_count = serializers.IntegerField(
+        source='rating_count',
+        read_only=True
+    )
 
     class Meta:
         model = Title
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+            'id', 'name', 'year', 'rating', 'review_count', 'description',
+            'genre', 'category'
         )
+        expandable_fields = ('genre', 'category')
 
 
 class TitleSerializer(serializers.ModelSerializer):
@@ -114,7 +177,7 @@ class TitleSerializer(serializers.ModelSerializer):
         return serializer.data
 
 
-class ReviewSerialiser(serializers.ModelSerializer):
+class ReviewSerialiser(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для модели отзывов."""
 
     author = serializers.SlugRelatedField(
@@ -137,19 +200,31 @@ class ReviewSerialiser(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        exclude = ('title',)
+        exclude = ('title', 'updated')
+
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique_review, поэтому
+        # отдельный запрос на проверку перед вставкой не нужен. Отзыв
+        # ищется только после ошибки, чтобы отличить повтор от других
+        # нарушений целостности, например удалённого автора.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not self.is_duplicate(validated_data):
+                raise
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [REVIEW_COUNT_ERROR]}
+            )
 
-    def validate(self, data):
-        request = self.context['request']
-        if request.method == 'POST':
-            if request.user.reviews.filter(
-                title_id=self.context['view'].kwargs['title_id']
-            ):
-                raise ValidationError(REVIEW_COUNT_ERROR)
-        return data
+    def is_duplicate(self, validated_data):
+        return Review.objects.filter(
+            author_id=validated_data['author'].pk,
+            title=validated_data['title']
+        ).exists()
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для модели комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -160,4 +235,4 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        exclude = ('review',)
+        exclude = ('review', 'updated')
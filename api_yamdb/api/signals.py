@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import User, roles_updated
+from .authentication import remember_role_state, remember_role_states
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: remember_role_state(instance))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: remember_role_state(instance, deleted=True)
+    )
+
+
+@receiver(roles_updated, sender=User)
+def user_roles_updated(sender, user_ids, using, **kwargs):
+    transaction.on_commit(
+        lambda: remember_role_states(user_ids), using=using
+    )
@@ -1,8 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet, JWTokenView,
-                    ReviewViewSet, SignupView, TitleViewSet, UserViewSet)
+from .views import (CategoryViewSet, CommentViewSet, ExportView, GenreViewSet,
+                    JWTokenView, ReviewViewSet, SignupView, TitleViewSet,
+                    UserViewSet)
 
 
 router = DefaultRouter()
@@ -28,6 +29,11 @@ auth_patterns = [
 
 v1_patterns = [
     path('auth/', include(auth_patterns)),
+    path(
+        'export/<str:resource>.<str:fmt>',
+        ExportView.as_view(),
+        name='export'
+    ),
     path('', include(router.urls)),
 ]
 
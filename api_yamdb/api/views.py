@@ -1,20 +1,32 @@
+from functools import partial
+
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator as token_gen
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import OuterRef
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import (IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title, User
-from .filters import TitleFilter
-from .mixins import ListCreateDestroyViewSet
+from reviews.models import (Category, Comment, DataVersion, Genre, Review,
+                            Title, User)
+from reviews.outbox import enqueue_email
+from reviews.versions import AUTHORS, CATALOGUE
+from .authentication import RoleRefreshToken, request_author
+from .cache import latest_change, shared_version
+from .export import export_response
+from .filters import TitleFilter, TitleOrderingFilter
+from .mixins import (CachedResponseMixin, ConditionalGetMixin,
+                     ConditionalListMixin, ListCreateDestroyViewSet,
+                     FastReadMixin, NestedResourceMixin,
+                     SparseQuerysetMixin)
+from .pagination import OptionalCursorPagination
 from .permissions import IsAdmin, IsAuthorOrAdminOrModerOrReadOnly, ReadOnly
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, GetTitleSerializer, MeSerializer,
@@ -42,16 +54,14 @@ class SignupView(APIView):
             serializer.is_valid(raise_exception=True)
             user = serializer.save()
 
-        user.confirmation_code = token_gen.make_token(user)
-        user.save()
-
-        send_mail(
-            'Регистрация в Yamdb',
-            f'Код подтверждения {user.confirmation_code}',
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
+        with transaction.atomic():
+            user.confirmation_code = token_gen.make_token(user)
+            user.save()
+            enqueue_email(
+                'Регистрация в Yamdb',
+                f'Код подтверждения {user.confirmation_code}',
+                user.email,
+            )
 
         return Response(
             {'email': user.email, 'username': user.username},
@@ -73,12 +83,21 @@ class JWTokenView(APIView):
             return Response(status=status.HTTP_404_NOT_FOUND)
         if data.get('confirmation_code') == user.confirmation_code:
             return Response(
-                {'token': str(RefreshToken.for_user(user).access_token)},
+                {'token': str(RoleRefreshToken.for_user(user).access_token)},
                 status=status.HTTP_201_CREATED
             )
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
 
+class ExportView(APIView):
+    """Потоковая выгрузка произведений, отзывов или комментариев."""
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request, resource, fmt):
+        return export_response(request, resource, fmt)
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """ViewSet для управления пользователями с дополнительным методом 'me'."""
 
@@ -97,7 +116,7 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated]
     )
     def me(self, request):
-        user = get_object_or_404(User, username=self.request.user)
+        user = get_object_or_404(User, pk=self.request.user.pk)
         if request.method == 'GET':
             serializer = MeSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -108,82 +127,199 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(
+    SparseQuerysetMixin, ConditionalListMixin, ListCreateDestroyViewSet
+):
     """ViewSet для категорий."""
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAdmin | ReadOnly]
+    page_size = 50
+    max_page_size = 500
+
+    def get_version_queryset(self):
+        return DataVersion.objects.filter(name=CATALOGUE).values_list(
+            'version', 'changed'
+        )
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(
+    SparseQuerysetMixin, ConditionalListMixin, ListCreateDestroyViewSet
+):
     """ViewSet для жанров."""
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = [IsAdmin | ReadOnly]
+    page_size = 50
+    max_page_size = 500
 
+    def get_version_queryset(self):
+        return DataVersion.objects.filter(name=CATALOGUE).values_list(
+            'version', 'changed'
+        )
 
-class TitleViewSet(viewsets.ModelViewSet):
+
+class TitleViewSet(
+    FastReadMixin, SparseQuerysetMixin, ConditionalGetMixin,
+    CachedResponseMixin, viewsets.ModelViewSet
+):
     """ViewSet для произведений."""
 
     queryset = (
         Title.objects
-        .annotate(
-            rating=Avg('reviews__score')
-        )
-        .order_by('reviews__score')
+        .select_related('category')
+        .prefetch_related('genre')
     )
     serializer_class = TitleSerializer
-    filter_backends = (DjangoFilterBackend,)
+    read_serializer_class = GetTitleSerializer
+    filter_backends = (DjangoFilterBackend, TitleOrderingFilter)
     filterset_class = TitleFilter
+    ordering_fields = ('name', 'year', 'rating')
+    ordering = ('name',)
+    page_size = 20
+    max_page_size = 100
     http_method_names = ALLOWED_METHODS
     permission_classes = [IsAdmin | ReadOnly]
 
-    def get_serializer_class(self):
-        if self.request.method == 'GET':
-            return GetTitleSerializer
-        return TitleSerializer
+    def get_version_queryset(self):
+        if self.action == 'retrieve':
+            return Title.objects.filter(pk=self.kwargs['pk']).values_list(
+                'updated', *shared_version(CATALOGUE)
+            )
+        return DataVersion.objects.filter(name=CATALOGUE).values_list(
+            'version', 'changed', latest_change(Title.objects.all())
+        )
+
+    @action(methods=['get'], detail=False)
+    def batch(self, request):
+        """Произведения по списку id `?ids=1,2,3` в порядке запроса."""
+
+        return self.conditional_response(
+            partial(self.cached_response, self.get_batch), request
+        )
+
+    def get_batch(self, request):
+        try:
+            ids = list(dict.fromkeys(
+                int(value) for value in
+                request.query_params.get('ids', '').split(',') if value
+            ))
+        except ValueError:
+            raise ValidationError({'ids': 'Ожидается список чисел.'})
+        if not ids:
+            raise ValidationError({'ids': 'Укажите хотя бы один id.'})
+        if len(ids) > settings.TITLE_BATCH_MAX_IDS:
+            raise ValidationError({'ids': (
+                f'Не больше {settings.TITLE_BATCH_MAX_IDS} id за запрос.'
+            )})
+        titles = self.sparse_queryset(self.get_queryset()).in_bulk(ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response(serializer.data)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    NestedResourceMixin, FastReadMixin, SparseQuerysetMixin,
+    ConditionalGetMixin, viewsets.ModelViewSet
+):
     """ViewSet для отзывов."""
 
     serializer_class = ReviewSerialiser
+    read_serializer_class = ReviewSerialiser
+    read_values = True
+    pagination_class = OptionalCursorPagination
     http_method_names = ALLOWED_METHODS
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         IsAuthorOrAdminOrModerOrReadOnly
     ]
+    parent_model = Title
+    parent_lookup = {'pk': 'title_id'}
+    parent_exists_only = True
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        self.check_parent()
+        # Без ?fields= список читается через .values() и select_related
+        # не применяется, а сериализатору DRF автор нужен одним JOIN.
+        return Review.objects.filter(
+            title_id=self.kwargs['title_id']
+        ).select_related('author')
+
+    def get_version_queryset(self):
+        if self.action == 'retrieve':
+            return Review.objects.filter(
+                pk=self.kwargs['pk'], title_id=self.kwargs['title_id']
+            ).values_list('updated', *shared_version(AUTHORS))
+        # Первым идёт счётчик отзывов: его использует get_counter_total.
+        return self.get_parent_queryset().values_list(
+            'rating_count', 'updated',
+            latest_change(Review.objects.filter(title=OuterRef('pk'))),
+            *shared_version(AUTHORS)
+        )
 
-    def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+    def get_counter_total(self):
+        # Счётчик отзывов поддерживается вместе с рейтингом произведения
+        # и выбирается вместе с версиями списка.
+        return self.get_resource_versions()[0]
 
-    def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs['title_id'])
+    def perform_create(self, serializer):
+        serializer.save(
+            author=request_author(self.request.user),
+            title=self.get_parent()
+        )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    NestedResourceMixin, FastReadMixin, SparseQuerysetMixin,
+    ConditionalGetMixin, viewsets.ModelViewSet
+):
     """ViewSet для комментариев."""
 
     serializer_class = CommentSerializer
+    read_serializer_class = CommentSerializer
+    read_values = True
+    pagination_class = OptionalCursorPagination
     http_method_names = ALLOWED_METHODS
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         IsAuthorOrAdminOrModerOrReadOnly
     ]
+    parent_model = Review
+    parent_lookup = {'pk': 'review_id', 'title_id': 'title_id'}
+    parent_exists_only = True
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        self.check_parent()
+        return Comment.objects.filter(
+            review_id=self.kwargs['review_id']
+        ).select_related('author')
+
+    def get_version_queryset(self):
+        if self.action == 'retrieve':
+            return Comment.objects.filter(
+                pk=self.kwargs['pk'], review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id']
+            ).values_list('updated', *shared_version(AUTHORS))
+        # Первым идёт счётчик комментариев: его использует
+        # get_counter_total.
+        return self.get_parent_queryset().values_list(
+            'comment_count', 'updated',
+            latest_change(Comment.objects.filter(review=OuterRef('pk'))),
+            *shared_version(AUTHORS)
+        )
 
-    def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+    def get_counter_total(self):
+        # Счётчик комментариев хранится в отзыве и выбирается вместе
+        # с версиями списка.
+        return self.get_resource_versions()[0]
 
-    def get_review(self):
-        return get_object_or_404(
-            Review.objects.filter(title_id=self.kwargs['title_id']),
-            pk=self.kwargs['review_id']
+    def perform_create(self, serializer):
+        # Отзыв нужен обработчикам сигналов комментария, поэтому при
+        # создании он загружается целиком.
+        serializer.save(
+            author=request_author(self.request.user),
+            review=self.get_parent()
         )
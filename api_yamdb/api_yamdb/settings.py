@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -61,6 +62,51 @@ DATABASES = {
     }
 }
 
+# Прагмы, которые применяются к каждому новому соединению с SQLite
+# (reviews/sqlite.py). Профиль выбирается переменной окружения
+# YAMDB_SQLITE_PROFILE. 'tuned' — журнал WAL, чтобы чтение не ждало
+# записи, fsync только при контрольных точках, mmap и кеш страниц
+# по 64 МиБ, временные таблицы в памяти и ожидание блокировок до 5 с.
+# 'default' оставляет настройки SQLite без изменений.
+SQLITE_PROFILE = os.environ.get('YAMDB_SQLITE_PROFILE', 'tuned')
+SQLITE_PROFILES = {
+    'default': {},
+    'tuned': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 64 * 1024 * 1024,
+        # Отрицательное значение задаёт размер кеша в КиБ, а не в страницах.
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
+    },
+    'revocations': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'revocations',
+        'OPTIONS': {'MAX_ENTRIES': 10 ** 6},
+    },
+}
+
+# Кеш записей об изменении прав пользователей для
+# `api.authentication.StatelessRoleAuthentication`. Он должен быть общим
+# для всех процессов и не вытеснять записи раньше срока жизни токена:
+# файловый кеш подходит, пока воркеры работают на одной машине (как и
+# с SQLite), для нескольких машин нужен Memcached. С кешем LocMem или
+# Dummy пользователь загружается из БД при каждом запросе.
+AUTH_REVOCATION_CACHE_ALIAS = 'revocations'
+
+# Кеш для ответов API и версий ресурсов. LocMemCache у каждого процесса
+# свой, при нескольких процессах нужен общий бэкенд (Redis, Memcached).
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 60 * 5
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -94,21 +140,66 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessRoleAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.LimitPageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
+# Наибольший размер страницы, который клиент может запросить через
+# `?page_size=` или `?limit=`, если представление не задаёт свой.
+API_MAX_PAGE_SIZE = 100
+
+# Как считать общее количество объектов в ответах со страницами, если
+# клиент не передал `?count=`: 'exact', 'estimate' или 'false'. В режиме
+# 'estimate' статистика БД используется только для таблиц и выборок не
+# меньше порога, остальные считаются точно.
+API_COUNT_MODE = 'exact'
+API_ESTIMATED_COUNT_THRESHOLD = 10000
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Искать ли слова запроса `?search=` в описаниях произведений,
+# а не только в названиях.
+TITLE_SEARCH_INCLUDE_DESCRIPTION = True
+
+# Сколько произведений можно запросить за раз через
+# `/api/v1/titles/batch/?ids=`.
+TITLE_BATCH_MAX_IDS = 200
+
+# Сколько строк выгрузка `/api/v1/export/` читает из БД за один раз.
+EXPORT_CHUNK_SIZE = 2000
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 DOMAIN_NAME = 'example.com'  # Замените на ваш домен
 DEFAULT_FROM_EMAIL = f'noreply@{DOMAIN_NAME}'
+
+# Когда отправлять письма из очереди: 'sync' — сразу после фиксации
+# транзакции в том же запросе, 'thread' — в фоновом потоке, который
+# отправляет всю очередь пачками через одно соединение, 'worker' —
+# только командой `python manage.py send_outbox`. В режимах 'sync' и
+# 'thread' письмо отправляется один раз, повторные попытки после
+# ошибок делает только `send_outbox`, поэтому её нужно запускать и в них.
+EMAIL_OUTBOX_MODE = 'thread'
+# Сколько секунд забранное на отправку письмо скрыто от других
+# отправителей. Если отправитель упал, письмо вернётся в очередь.
+EMAIL_OUTBOX_LEASE = 5 * 60
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 60 * 60
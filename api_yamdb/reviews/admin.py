@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
-from .models import Category, Comment, Genre, GenreTitle, Review, Title, User
+from .models import (Category, Comment, EmailOutbox, Genre, GenreTitle,
+                     Review, Title, User)
 
 
 User = get_user_model()
@@ -13,3 +14,4 @@ admin.site.register(Genre)
 admin.site.register(Title)
 admin.site.register(GenreTitle)
 admin.site.register(Review)
+admin.site.register(EmailOutbox)
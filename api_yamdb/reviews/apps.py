@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import restore_search_index
+        from .sqlite import configure_connection
+        from .versions import (restore_shared_versions,
+                               restore_version_triggers)
+
+        post_migrate.connect(restore_search_index, sender=self)
+        post_migrate.connect(restore_version_triggers, sender=self)
+        post_migrate.connect(restore_shared_versions, sender=self)
+        connection_created.connect(configure_connection)
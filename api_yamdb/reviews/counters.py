@@ -0,0 +1,76 @@
+from django.db.models import (Avg, Count, ExpressionWrapper, F, FloatField,
+                              OuterRef, Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from .models import Comment, Review, Title
+
+
+def average(total, count):
+    """Выражение для среднего значения; NULL при нулевом количестве."""
+
+    return ExpressionWrapper(
+        Cast(total, FloatField()) / NullIf(count, 0),
+        output_field=FloatField()
+    )
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """Атомарно изменяет сумму, количество оценок и рейтинг произведения."""
+
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=average(rating_sum, rating_count),
+    )
+
+
+def update_comment_count(review_id, delta):
+    """Атомарно изменяет количество комментариев отзыва."""
+
+    Review.objects.filter(pk=review_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+def rebuild_title_ratings():
+    """Пересчитывает рейтинги всех произведений одним запросом."""
+
+    reviews = (
+        Review.objects
+        .filter(title=OuterRef('pk'))
+        .order_by()
+        .values('title')
+    )
+    return Title.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0
+        ),
+        rating=Subquery(
+            reviews.annotate(
+                total=Avg('score', output_field=FloatField())
+            ).values('total')
+        ),
+    )
+
+
+def rebuild_comment_counts():
+    """Пересчитывает количество комментариев всех отзывов одним запросом."""
+
+    comments = (
+        Comment.objects
+        .filter(review=OuterRef('pk'))
+        .order_by()
+        .values('review')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Review.objects.update(
+        comment_count=Coalesce(Subquery(comments), 0)
+    )
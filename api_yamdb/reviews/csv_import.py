@@ -0,0 +1,385 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import (Category, Comment, Genre, GenreTitle, Review, Title,
+                     User)
+
+
+def optional_int(value):
+    return int(value) if value else None
+
+
+def aware_datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f'Некорректная дата: {value!r}')
+    return parsed
+
+
+@dataclass(frozen=True)
+class FileSpec:
+    """Описание CSV-файла: модель и соответствие колонок полям."""
+
+    name: str
+    model: type
+    fields: tuple
+    depends_on: tuple = ()
+    defaults: tuple = ()
+
+    @property
+    def filename(self):
+        return f'{self.name}.csv'
+
+    def build(self, row):
+        values = dict(self.defaults)
+        for field, column, convert in self.fields:
+            values[field] = convert(row[column])
+        return values
+
+
+SPECS = (
+    FileSpec('category', Category, (
+        ('id', 'id', int),
+        ('name', 'name', str),
+        ('slug', 'slug', str),
+    )),
+    FileSpec('genre', Genre, (
+        ('id', 'id', int),
+        ('name', 'name', str),
+        ('slug', 'slug', str),
+    )),
+    FileSpec('titles', Title, (
+        ('id', 'id', int),
+        ('name', 'name', str),
+        ('year', 'year', int),
+        ('category_id', 'category', optional_int),
+    ), depends_on=('category',)),
+    FileSpec('genre_title', GenreTitle, (
+        ('id', 'id', int),
+        ('title_id', 'title_id', int),
+        ('genre_id', 'genre_id', int),
+    ), depends_on=('titles', 'genre')),
+    FileSpec('users', User, (
+        ('id', 'id', int),
+        ('username', 'username', str),
+        ('email', 'email', str),
+        ('role', 'role', str),
+        ('bio', 'bio', str),
+        ('first_name', 'first_name', str),
+        ('last_name', 'last_name', str),
+    ), defaults=(('password', make_password(None)),)),
+    FileSpec('review', Review, (
+        ('id', 'id', int),
+        ('title_id', 'title_id', int),
+        ('text', 'text', str),
+        ('author_id', 'author', int),
+        ('score', 'score', int),
+        ('pub_date', 'pub_date', aware_datetime),
+    ), depends_on=('titles', 'users')),
+    FileSpec('comments', Comment, (
+        ('id', 'id', int),
+        ('review_id', 'review_id', int),
+        ('text', 'text', str),
+        ('author_id', 'author', int),
+        ('pub_date', 'pub_date', aware_datetime),
+    ), depends_on=('review', 'users')),
+)
+SPECS_BY_NAME = {spec.name: spec for spec in SPECS}
+MAX_REPORTED_ERRORS = 10
+
+INSERT = 'insert'
+UPSERT = 'upsert'
+MODES = (INSERT, UPSERT)
+
+
+def dependency_order(specs):
+    """Упорядочивает файлы так, чтобы зависимости загружались раньше.
+
+    Зависимости, которых нет среди `specs`, считаются уже загруженными.
+    """
+
+    pending = list(specs)
+    names = {spec.name for spec in pending}
+    done = set()
+    ordered = []
+    while pending:
+        ready = [
+            spec for spec in pending
+            if all(
+                name in done or name not in names
+                for name in spec.depends_on
+            )
+        ]
+        if not ready:
+            raise ValueError(
+                'Циклическая зависимость между файлами: '
+                + ', '.join(spec.name for spec in pending)
+            )
+        for spec in ready:
+            pending.remove(spec)
+            done.add(spec.name)
+            ordered.append(spec)
+    return ordered
+
+
+@dataclass
+class ValidationReport:
+    """Результат проверки файла.
+
+    `chunks` — пачки значений полей со смещением конца каждой пачки,
+    готовые для `load_file`. Если в файле есть ошибки, пачек нет.
+    """
+
+    name: str
+    rows: int
+    errors: list
+    seconds: float
+    chunks: list
+
+
+def read_header(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return next(csv.reader(file), [])
+
+
+def read_rows(path, offset=0):
+    """Читает строки файла, начиная с байта `offset` после заголовка.
+
+    Вместе со строкой отдаёт смещение её конца в байтах, чтобы загрузку
+    можно было продолжить с этого места без чтения начала файла.
+    """
+
+    with open(path, 'rb') as file:
+        position = 0
+
+        def lines():
+            nonlocal position
+            for line in file:
+                position += len(line)
+                yield line.decode('utf-8')
+
+        source = lines()
+        fieldnames = next(csv.reader(source), None)
+        if offset:
+            file.seek(offset)
+            position = offset
+        for row in csv.DictReader(source, fieldnames=fieldnames):
+            yield row, position
+
+
+def validate_file(name, path, chunk_size, offset=0, done=0):
+    """Проверяет файл и преобразует строки в значения полей.
+
+    Выполняется в отдельном процессе, поэтому принимает имя файла,
+    а не его описание. Читаются строки после контрольной точки
+    (`offset` в байтах, `done` строк до неё), и преобразованные пачки
+    возвращаются в отчёте, чтобы `load_file` не разбирал файл второй
+    раз. Цена этого — пачки файла держатся в памяти основного процесса,
+    пока файл не загружен.
+    """
+
+    started = time.perf_counter()
+    spec = SPECS_BY_NAME[name]
+    errors = []
+    chunks = []
+    rows = 0
+    missing = {column for _, column, _ in spec.fields} - set(
+        read_header(path)
+    )
+    if missing:
+        errors.append(f'нет колонок: {", ".join(sorted(missing))}')
+    else:
+        for chunk in chunked(read_rows(path, offset), chunk_size):
+            values = []
+            for row, _ in chunk:
+                rows += 1
+                if len(errors) >= MAX_REPORTED_ERRORS:
+                    continue
+                try:
+                    values.append(spec.build(row))
+                except (TypeError, ValueError) as error:
+                    errors.append(f'строка {done + rows + 1}: {error}')
+            if not errors:
+                chunks.append((values, chunk[-1][1]))
+    return ValidationReport(
+        name, rows, errors, time.perf_counter() - started,
+        [] if errors else chunks
+    )
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def preserve_dates(model):
+    """Сохраняет даты из файла вместо текущего времени у auto_now_add."""
+
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class ImportState:
+    """Контрольные точки загрузки в JSON-файле.
+
+    Для каждого файла хранится режим загрузки, размер и время изменения
+    файла, число загруженных строк и смещение в байтах, до которого файл
+    прочитан. Файл состояния перезаписывается атомарно после фиксации
+    каждой пачки, поэтому прерванная загрузка продолжается с места
+    остановки. Если файл изменился или загрузка идёт в другом режиме,
+    файл загружается заново. Без `path` состояние не сохраняется.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.files = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self.files = json.load(file)
+
+    def progress(self, name, mode, fingerprint):
+        """Число загруженных строк и смещение, с которого продолжать."""
+
+        entry = self.files.get(name)
+        if (
+            entry is None or entry.get('mode') != mode
+            or entry.get('file') != fingerprint
+        ):
+            return 0, 0
+        return entry['rows'], entry['offset']
+
+    def mark(self, name, mode, fingerprint, rows, offset):
+        self.files[name] = {
+            'mode': mode, 'file': fingerprint, 'rows': rows,
+            'offset': offset,
+        }
+        self.save()
+
+    def save(self):
+        if self.path is None:
+            return
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self.files, file)
+        os.replace(temporary, self.path)
+
+
+@dataclass
+class LoadReport:
+    """Результат загрузки файла."""
+
+    rows: int = 0
+    written: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+
+def insert_chunk(spec, values, report):
+    # Строки с уже существующими id пропускаются: пачка, которая успела
+    # сохраниться перед сбоем, но не попала в контрольную точку, при
+    # повторном запуске не приводит к ошибке.
+    existing = set(spec.model.objects.filter(
+        pk__in=[item['id'] for item in values]
+    ).values_list('pk', flat=True))
+    created = [
+        spec.model(**item) for item in values if item['id'] not in existing
+    ]
+    spec.model.objects.bulk_create(created)
+    report.written += len(created)
+
+
+def upsert_chunk(spec, values, report):
+    # В Django 3.2 у bulk_create нет update_conflicts, поэтому
+    # существующие строки читаются одним запросом, а обновляются только
+    # те, что отличаются от файла.
+    fields = [field for field, _, _ in spec.fields if field != 'id']
+    existing = spec.model.objects.in_bulk([item['id'] for item in values])
+    created, changed = [], []
+    for item in values:
+        instance = existing.get(item['id'])
+        if instance is None:
+            created.append(spec.model(**item))
+        elif any(getattr(instance, name) != item[name] for name in fields):
+            for name in fields:
+                setattr(instance, name, item[name])
+            changed.append(instance)
+    spec.model.objects.bulk_create(created)
+    spec.model.objects.bulk_update(changed, fields)
+    report.written += len(created)
+    report.updated += len(changed)
+
+
+def converted_chunks(spec, path, chunk_size, offset=0):
+    """Пачки значений полей со смещением конца каждой пачки."""
+
+    for chunk in chunked(read_rows(path, offset), chunk_size):
+        yield [spec.build(row) for row, _ in chunk], chunk[-1][1]
+
+
+def load_file(spec, path, chunk_size, mode=INSERT, state=None, chunks=None):
+    """Загружает файл пачками по `chunk_size` строк.
+
+    Каждая пачка сохраняется в своей транзакции. Внешние ключи берутся
+    из файла как есть, без запросов к связанным таблицам. Если в `state`
+    есть контрольная точка для этого файла и режима, чтение начинается
+    с сохранённого смещения, а загруженные раньше строки считаются
+    пропущенными. В режиме `upsert` изменённые строки обновляются,
+    в режиме `insert` существующие остаются как были.
+
+    `chunks` — пачки, уже преобразованные `validate_file` с той же
+    контрольной точки; без них файл читается и преобразуется здесь.
+    """
+
+    state = state or ImportState()
+    save_chunk = upsert_chunk if mode == UPSERT else insert_chunk
+    fingerprint = file_fingerprint(path)
+    done, offset = state.progress(spec.name, mode, fingerprint)
+    if chunks is None:
+        chunks = converted_chunks(spec, path, chunk_size, offset)
+    report = LoadReport(rows=done, skipped=done)
+    with preserve_dates(spec.model):
+        for values, end in chunks:
+            with transaction.atomic():
+                save_chunk(spec, values, report)
+            report.rows += len(values)
+            state.mark(spec.name, mode, fingerprint, report.rows, end)
+    return report
+
+
+def reset_sequences(models):
+    """Сдвигает счётчики id после вставки строк с явными id."""
+
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
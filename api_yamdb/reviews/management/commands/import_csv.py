@@ -0,0 +1,146 @@
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.counters import rebuild_comment_counts, rebuild_title_ratings
+from reviews.csv_import import (INSERT, MODES, SPECS, ImportState,
+                                dependency_order, file_fingerprint,
+                                load_file, reset_sequences, validate_file)
+
+STATE_FILENAME = '.import_state.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает данные из CSV-файлов в БД. Файлы проверяются и '
+        'преобразуются параллельно и загружаются в порядке зависимостей '
+        'между ними.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files', nargs='*',
+            help='Имена файлов без расширения; по умолчанию все.'
+        )
+        parser.add_argument(
+            '--path', type=Path,
+            default=settings.BASE_DIR / 'static' / 'data',
+            help='Каталог с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=10000,
+            help='Сколько строк сохранять одной пачкой.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Сколько процессов проверяют файлы; 1 — без пула.'
+        )
+        parser.add_argument(
+            '--mode', choices=MODES, default=INSERT,
+            help=(
+                'insert — добавлять только новые строки, upsert — также '
+                'обновлять изменившиеся.'
+            )
+        )
+        parser.add_argument(
+            '--state', type=Path,
+            help=(
+                'Файл с контрольными точками загрузки; по умолчанию '
+                f'{STATE_FILENAME} в каталоге с CSV-файлами.'
+            )
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Не продолжать прерванную загрузку, а начать заново.'
+        )
+
+    def handle(self, *args, **options):
+        known = {spec.name for spec in SPECS}
+        unknown = set(options['files']) - known
+        if unknown:
+            raise CommandError(
+                f'Неизвестные файлы: {", ".join(sorted(unknown))}'
+            )
+        if options['workers'] < 1:
+            raise CommandError('--workers должно быть не меньше 1')
+        specs = dependency_order([
+            spec for spec in SPECS
+            if not options['files'] or spec.name in options['files']
+        ])
+        path = options['path']
+        state_path = options['state'] or path / STATE_FILENAME
+        if options['restart'] and state_path.exists():
+            state_path.unlink()
+        options['import_state'] = ImportState(state_path)
+        started = time.perf_counter()
+        workers = min(options['workers'], len(specs))
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=django.setup
+            ) as pool:
+                reports = {
+                    spec.name: pool.submit(
+                        validate_file, *self.validate_args(spec, options)
+                    )
+                    for spec in specs
+                }
+                self.load(specs, reports, options)
+        else:
+            self.load(specs, self.validate_inline(specs, options), options)
+        reset_sequences([spec.model for spec in specs])
+        rebuild_title_ratings()
+        rebuild_comment_counts()
+        # Версии ресурсов API обновили триггеры БД при вставке строк,
+        # поэтому ответы из кеша и ETag всех процессов уже устарели.
+        self.stdout.write(self.style.SUCCESS(
+            f'Загрузка завершена за {time.perf_counter() - started:.2f} с'
+        ))
+
+    def validate_args(self, spec, options):
+        # Файл проверяется с той же контрольной точки, с которой его
+        # продолжит load_file, чтобы тот записал готовые пачки.
+        path = options['path'] / spec.filename
+        done, offset = options['import_state'].progress(
+            spec.name, options['mode'], file_fingerprint(path)
+        )
+        return spec.name, path, options['chunk_size'], offset, done
+
+    def validate_inline(self, specs, options):
+        reports = {}
+        for spec in specs:
+            future = Future()
+            future.set_result(
+                validate_file(*self.validate_args(spec, options))
+            )
+            reports[spec.name] = future
+        return reports
+
+    def load(self, specs, reports, options):
+        for spec in specs:
+            report = reports[spec.name].result()
+            self.stdout.write(
+                f'проверка {spec.filename}: {report.rows} строк за '
+                f'{report.seconds:.2f} с'
+            )
+            if report.errors:
+                raise CommandError(
+                    f'Ошибки в {spec.filename}:\n' + '\n'.join(report.errors)
+                )
+            started = time.perf_counter()
+            result = load_file(
+                spec, options['path'] / spec.filename, options['chunk_size'],
+                mode=options['mode'], state=options['import_state'],
+                chunks=report.chunks
+            )
+            seconds = time.perf_counter() - started
+            self.stdout.write(
+                f'загрузка {spec.filename}: {result.rows} строк за '
+                f'{seconds:.2f} с ({result.rows / max(seconds, 1e-9):.0f} '
+                f'строк/с), записано {result.written}, обновлено '
+                f'{result.updated}, пропущено {result.skipped}'
+            )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.counters import rebuild_comment_counts, rebuild_title_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинги и количество отзывов произведений '
+        'и количество комментариев отзывов.'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            titles = rebuild_title_ratings()
+            reviews = rebuild_comment_counts()
+        # Версии ресурсов API обновили триггеры БД при изменении строк,
+        # поэтому ответы из кеша и ETag всех процессов уже устарели.
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано произведений: {titles}, отзывов: {reviews}'
+        ))
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько писем отправлять через одно соединение.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза в секундах, если в очереди нет писем.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить одну пачку писем и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_pending(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, с ошибкой: {failed}'
+                )
+            if options['once']:
+                return
+            if not sent and not failed:
+                time.sleep(options['interval'])
@@ -0,0 +1,76 @@
+from django.db import migrations
+
+# Поисковый индекс на момент этой миграции. Таблицы и колонки указаны
+# явно, чтобы миграция не зависела от текущих моделей.
+SQLITE_INDEX_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_title_fts USING fts5("
+    "name, description, content='reviews_title', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_ai "
+    "AFTER INSERT ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_ad "
+    "AFTER DELETE ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_au "
+    "AFTER UPDATE OF name, description ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+)
+SQLITE_DROP_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ai',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ad',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_au',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+POSTGRESQL_INDEX_SQL = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS reviews_title_name_trgm_idx '
+    'ON reviews_title USING gin (name gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS reviews_title_name_tsv_idx '
+    "ON reviews_title USING gin ((to_tsvector('simple', "
+    'reviews_title.name)))',
+    'CREATE INDEX IF NOT EXISTS reviews_title_full_tsv_idx '
+    "ON reviews_title USING gin (((setweight(to_tsvector('simple', "
+    "reviews_title.name), 'A') || setweight(to_tsvector('simple', "
+    "reviews_title.description), 'B'))))",
+)
+POSTGRESQL_DROP_SQL = (
+    'DROP INDEX IF EXISTS reviews_title_name_trgm_idx',
+    'DROP INDEX IF EXISTS reviews_title_name_tsv_idx',
+    'DROP INDEX IF EXISTS reviews_title_full_tsv_idx',
+)
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        connection = schema_editor.connection
+        with connection.cursor() as cursor:
+            for sql in statements.get(connection.vendor, ()):
+                cursor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_pub_date_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({
+                'sqlite': SQLITE_INDEX_SQL,
+                'postgresql': POSTGRESQL_INDEX_SQL,
+            }),
+            run({
+                'sqlite': SQLITE_DROP_SQL,
+                'postgresql': POSTGRESQL_DROP_SQL,
+            }),
+        ),
+    ]
@@ -0,0 +1,173 @@
+# Generated by Django 3.2 on 2026-10-18 06:08
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# Триггеры версий данных на момент этой миграции: таблица, событие
+# и SQL, где {now} — текущее время. Таблицы и колонки указаны явно,
+# чтобы миграция не зависела от текущих моделей.
+VERSION_BUMP = (
+    'INSERT INTO reviews_dataversion (name, version, changed) '
+    "VALUES ('{name}', 1, {{now}}) ON CONFLICT (name) DO UPDATE "
+    'SET version = reviews_dataversion.version + 1, changed = {{now}}'
+)
+BUMP_CATALOGUE = VERSION_BUMP.format(name='catalogue')
+BUMP_AUTHORS = VERSION_BUMP.format(name='authors')
+TRIGGERS = (
+    ('reviews_title', 'INSERT', (BUMP_CATALOGUE,)),
+    ('reviews_title', 'DELETE', (BUMP_CATALOGUE,)),
+    (
+        'reviews_title',
+        'UPDATE OF name, year, description, category_id, rating, '
+        'rating_count',
+        ('UPDATE reviews_title SET updated = {now} WHERE id = NEW.id',),
+    ),
+    ('reviews_genretitle', 'INSERT', (
+        'UPDATE reviews_title SET updated = {now} WHERE id = NEW.title_id',
+    )),
+    ('reviews_genretitle', 'DELETE', (
+        'UPDATE reviews_title SET updated = {now} WHERE id = OLD.title_id',
+    )),
+    ('reviews_genretitle', 'UPDATE OF genre_id, title_id', (
+        'UPDATE reviews_title SET updated = {now} '
+        'WHERE id IN (OLD.title_id, NEW.title_id)',
+    )),
+    ('reviews_category', 'INSERT', (BUMP_CATALOGUE,)),
+    ('reviews_category', 'UPDATE', (BUMP_CATALOGUE,)),
+    ('reviews_category', 'DELETE', (BUMP_CATALOGUE,)),
+    ('reviews_genre', 'INSERT', (BUMP_CATALOGUE,)),
+    ('reviews_genre', 'UPDATE', (BUMP_CATALOGUE,)),
+    ('reviews_genre', 'DELETE', (BUMP_CATALOGUE,)),
+    (
+        'reviews_review',
+        'UPDATE OF title_id, author_id, text, score, pub_date, '
+        'comment_count',
+        (
+            'UPDATE reviews_review SET updated = {now} WHERE id = NEW.id',
+            'UPDATE reviews_title SET updated = {now} '
+            'WHERE id = OLD.title_id AND id <> NEW.title_id',
+        ),
+    ),
+    ('reviews_review', 'DELETE', (
+        'UPDATE reviews_title SET updated = {now} WHERE id = OLD.title_id',
+    )),
+    (
+        'reviews_comment',
+        'UPDATE OF review_id, author_id, text, pub_date',
+        (
+            'UPDATE reviews_comment SET updated = {now} WHERE id = NEW.id',
+            'UPDATE reviews_review SET updated = {now} '
+            'WHERE id = OLD.review_id AND id <> NEW.review_id',
+        ),
+    ),
+    ('reviews_comment', 'DELETE', (
+        'UPDATE reviews_review SET updated = {now} WHERE id = OLD.review_id',
+    )),
+    ('reviews_user', 'UPDATE OF username', (BUMP_AUTHORS,)),
+)
+NOW = {
+    'sqlite': "strftime('%Y-%m-%d %H:%M:%f', 'now')",
+    'postgresql': 'clock_timestamp()',
+}
+
+
+def trigger_name(table, event):
+    return f'{table}_version_{event.split()[0].lower()}'
+
+
+def install(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in NOW:
+        return
+    with connection.cursor() as cursor:
+        for table, event, statements in TRIGGERS:
+            trigger = trigger_name(table, event)
+            body = ' '.join(
+                f'{statement.format(now=NOW[connection.vendor])};'
+                for statement in statements
+            )
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {trigger} '
+                    f'AFTER {event} ON {table} BEGIN {body} END'
+                )
+                continue
+            cursor.execute(
+                f'CREATE OR REPLACE FUNCTION {trigger}() RETURNS trigger '
+                f'AS $$ BEGIN {body} RETURN NULL; END $$ LANGUAGE plpgsql'
+            )
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger} ON {table}')
+            cursor.execute(
+                f'CREATE TRIGGER {trigger} AFTER {event} ON {table} '
+                f'FOR EACH ROW EXECUTE PROCEDURE {trigger}()'
+            )
+
+
+def uninstall(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        for table, event, _ in TRIGGERS:
+            trigger = trigger_name(table, event)
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            elif connection.vendor == 'postgresql':
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger} ON {table}')
+                cursor.execute(f'DROP FUNCTION IF EXISTS {trigger}()')
+
+
+def create_versions(apps, schema_editor):
+    DataVersion = apps.get_model('reviews', 'DataVersion')
+    DataVersion.objects.bulk_create([
+        DataVersion(name='catalogue'), DataVersion(name='authors'),
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_review_comment_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='Имя')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Номер версии')),
+                ('changed', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'версия данных',
+                'verbose_name_plural': 'Версии данных',
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='updated',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='дата изменения'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='updated',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='дата изменения'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='updated',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='дата изменения'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['updated'], name='title_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'updated'], name='review_title_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'updated'], name='comment_review_updated_idx'),
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+        migrations.RunPython(install, uninstall),
+    ]
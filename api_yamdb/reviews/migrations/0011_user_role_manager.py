@@ -0,0 +1,20 @@
+# Generated by Django 3.2 on 2026-10-18 06:15
+
+from django.db import migrations
+import reviews.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_data_version'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', reviews.models.RoleUserManager()),
+            ],
+        ),
+    ]
@@ -1,8 +1,10 @@
 from datetime import datetime
 
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
 
 from .validators import regex_validator, validate_not_me
 
@@ -17,6 +19,33 @@ WRONG_RATING = (f'Оценка должна лежать в диапазоне 
                 f'до {MAX_RATING}!')
 
 
+# Поля пользователя, от которых зависят его права.
+ROLE_FIELDS = frozenset(('role', 'is_superuser', 'is_active'))
+
+# Отправляется, когда права пользователей изменены через
+# `QuerySet.update` или `bulk_update` без сигналов `post_save`.
+roles_updated = Signal()
+
+
+class UserQuerySet(models.QuerySet):
+    """Выборка пользователей, сообщающая о массовой смене прав."""
+
+    def update(self, **kwargs):
+        if not ROLE_FIELDS & kwargs.keys():
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            user_ids = list(self.values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+            roles_updated.send(
+                sender=self.model, user_ids=user_ids, using=self.db
+            )
+        return rows
+
+
+class RoleUserManager(UserManager.from_queryset(UserQuerySet)):
+    """Менеджер пользователей с `UserQuerySet`."""
+
+
 class User(AbstractUser):
     """Кастомный класс пользователей."""
 
@@ -63,6 +92,8 @@ class User(AbstractUser):
     )
     confirmation_code = models.CharField(max_length=100, blank=True)
 
+    objects = RoleUserManager()
+
     @property
     def is_admin(self):
         return self.role == self.ADMIN or self.is_superuser
@@ -166,11 +197,39 @@ class Title(models.Model):
         verbose_name='категория',
         null=True
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        verbose_name='рейтинг',
+        null=True,
+        editable=False
+    )
+    updated = models.DateTimeField(
+        verbose_name='дата изменения',
+        default=timezone.now,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+            models.Index(fields=('year', 'id'), name='title_year_id_idx'),
+            models.Index(
+                fields=('rating', 'id'), name='title_rating_id_idx'
+            ),
+            models.Index(fields=('updated',), name='title_updated_idx'),
+        ]
 
     def __str__(self):
         return self.name[:DESCRIPTION_LENGTH_LIMIT]
@@ -194,6 +253,11 @@ class GenreTitle(models.Model):
         verbose_name = 'Жанр - произведение'
         verbose_name_plural = 'Жанры - произведения'
         ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=('genre', 'title'), name='genretitle_genre_title_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.title} соответствует жанру: {self.genre}'
@@ -230,12 +294,31 @@ class Review(models.Model):
         'Дата добавления',
         auto_now_add=True,
     )
+    comment_count = models.PositiveIntegerField(
+        verbose_name='количество комментариев',
+        default=0,
+        editable=False
+    )
+    updated = models.DateTimeField(
+        verbose_name='дата изменения',
+        default=timezone.now,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'отзыв'
         verbose_name_plural = 'Отзывы'
         default_related_name = 'reviews'
         ordering = ('pub_date',)
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=('title', 'updated'), name='review_title_updated_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -243,6 +326,12 @@ class Review(models.Model):
             ),
         ]
 
+    def save(self, *args, **kwargs):
+        # Счётчики рейтинга произведения обновляются в обработчиках сигналов,
+        # поэтому они должны попасть в одну транзакцию с самим отзывом.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return (
             f'{self.title} | '
@@ -270,12 +359,32 @@ class Comment(models.Model):
         'Дата добавления',
         auto_now_add=True,
     )
+    updated = models.DateTimeField(
+        verbose_name='дата изменения',
+        default=timezone.now,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ('pub_date',)
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=('review', 'updated'),
+                name='comment_review_updated_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Счётчик комментариев отзыва обновляется в обработчике сигнала.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return (
@@ -283,3 +392,56 @@ class Comment(models.Model):
             f'{self.review} | '
             f'{self.author} | '
         )
+
+
+class EmailOutbox(models.Model):
+    """Очередь исходящих писем."""
+
+    subject = models.CharField('Тема', max_length=MAX_CHAR_LENGTH)
+    body = models.TextField('Текст')
+    recipient = models.EmailField('Получатель', max_length=254)
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+    send_after = models.DateTimeField(
+        'Отправить после',
+        default=timezone.now,
+    )
+    sent = models.DateTimeField('Дата отправки', null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(
+        'Количество попыток',
+        default=0,
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('send_after',)
+        indexes = [
+            models.Index(
+                fields=('sent', 'send_after'), name='outbox_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient} | {self.subject[:DESCRIPTION_LENGTH_LIMIT]}'
+
+
+class DataVersion(models.Model):
+    """Общая версия данных, которые редко меняются.
+
+    Строки `catalogue` и `authors` обновляют триггеры БД (см.
+    reviews/versions.py) при изменении категорий, жанров, состава
+    произведений и имён пользователей. Изменения отдельных
+    произведений, отзывов и комментариев отражает их поле `updated`.
+    """
+
+    name = models.CharField('Имя', max_length=64, primary_key=True)
+    version = models.PositiveBigIntegerField('Номер версии', default=0)
+    changed = models.DateTimeField('Дата изменения', default=timezone.now)
+
+    class Meta:
+        verbose_name = 'версия данных'
+        verbose_name_plural = 'Версии данных'
+
+    def __str__(self):
+        return f'{self.name} | {self.version}'
@@ -0,0 +1,174 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EmailOutbox
+from .sqlite import immediate_atomic
+
+
+SYNC = 'sync'
+THREAD = 'thread'
+WORKER = 'worker'
+
+logger = logging.getLogger(__name__)
+
+_wakeup = threading.Event()
+_sender = None
+_sender_lock = threading.Lock()
+
+
+def enqueue_email(subject, body, recipient):
+    """Ставит письмо в очередь.
+
+    Письмо уходит после фиксации транзакции: в режиме `sync` в том же
+    запросе, в режиме `thread` его отправит фоновый поток вместе с
+    остальными письмами очереди, в режиме `worker` — команда
+    `send_outbox`. Повторные попытки после ошибок делает только команда
+    `send_outbox`.
+    """
+
+    email = EmailOutbox.objects.create(
+        subject=subject, body=body, recipient=recipient
+    )
+    mode = settings.EMAIL_OUTBOX_MODE
+    if mode == SYNC:
+        transaction.on_commit(lambda: send_pending(ids=[email.pk]))
+    elif mode == THREAD:
+        transaction.on_commit(wake_sender)
+    return email
+
+
+def wake_sender():
+    """Будит фоновый поток отправки, при необходимости запуская его."""
+
+    global _sender
+    with _sender_lock:
+        if _sender is None or not _sender.is_alive():
+            _sender = threading.Thread(
+                target=_send_forever, name='outbox', daemon=True
+            )
+            _sender.start()
+    _wakeup.set()
+
+
+def _send_forever():
+    # Поток отправляет очередь пачками, пока она не опустеет, и ждёт
+    # следующего письма. Письма, поставленные в очередь во время
+    # отправки, снова будят поток, и он проходит очередь ещё раз.
+    while True:
+        _wakeup.wait()
+        _wakeup.clear()
+        try:
+            while any(send_pending()):
+                pass
+        except Exception:
+            logger.exception('Не удалось отправить письма из очереди.')
+        finally:
+            connections.close_all()
+
+
+def retry_delay(attempts):
+    """Задержка перед повторной отправкой растёт вдвое с каждой попыткой."""
+
+    return timedelta(seconds=min(
+        settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_RETRY_DELAY
+    ))
+
+
+def mark_failed(email, error, now):
+    email.send_after = now + retry_delay(email.attempts)
+    email.last_error = repr(error)
+
+
+def claim(batch_size=100, ids=None):
+    """Забирает пачку готовых к отправке писем.
+
+    Письма получают аренду: `send_after` сдвигается на
+    `EMAIL_OUTBOX_LEASE` секунд, и другие отправители их не видят, пока
+    аренда не истечёт. Попытка засчитывается сразу, поэтому письмо,
+    на котором отправитель падает, не будет браться бесконечно.
+    """
+
+    now = timezone.now()
+    pending = EmailOutbox.objects.filter(
+        sent__isnull=True,
+        send_after__lte=now,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+    if ids is not None:
+        pending = pending.filter(pk__in=ids)
+    with immediate_atomic():
+        emails = list(
+            pending.select_for_update(skip_locked=True)[:batch_size]
+        )
+        EmailOutbox.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(
+            attempts=F('attempts') + 1,
+            send_after=now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE
+            ),
+        )
+    for email in emails:
+        email.attempts += 1
+    return emails
+
+
+def send_pending(batch_size=100, ids=None):
+    """Отправляет готовые к отправке письма через одно SMTP-соединение.
+
+    Письма забираются в одной короткой транзакции, отправляются вне
+    транзакций, а результат записывается во второй короткой транзакции,
+    так что запись в БД во время отправки ничего не блокирует. Ошибки
+    соединения и отправки не выбрасываются: письмо получает следующую
+    попытку с растущей задержкой. Возвращает количество отправленных и
+    неотправленных писем.
+    """
+
+    emails = claim(batch_size, ids)
+    if not emails:
+        return 0, 0
+    sent, failed = [], []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        # Сервер не принял соединение: вся пачка ждёт повтора.
+        now = timezone.now()
+        for email in emails:
+            mark_failed(email, error, now)
+        failed = emails
+    else:
+        try:
+            for email in emails:
+                try:
+                    EmailMessage(
+                        email.subject,
+                        email.body,
+                        settings.DEFAULT_FROM_EMAIL,
+                        [email.recipient],
+                        connection=connection,
+                    ).send()
+                except Exception as error:
+                    mark_failed(email, error, timezone.now())
+                    failed.append(email)
+                else:
+                    sent.append(email.pk)
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                # Письма уже переданы серверу, ошибка при закрытии
+                # соединения на них не влияет.
+                pass
+    with transaction.atomic():
+        EmailOutbox.objects.filter(pk__in=sent).update(sent=timezone.now())
+        EmailOutbox.objects.bulk_update(failed, ('send_after', 'last_error'))
+    return len(sent), len(failed)
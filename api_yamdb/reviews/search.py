@@ -0,0 +1,166 @@
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Title
+
+
+FTS_TABLE = 'reviews_title_fts'
+TITLE_TABLE = Title._meta.db_table
+SEARCH_INDEX_MIGRATION = '0006_title_search_index'
+TOKEN_PATTERN = re.compile(r'\w+')
+
+SQLITE_INDEX_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"name, description, content='{TITLE_TABLE}', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai "
+    f"AFTER INSERT ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad "
+    f"AFTER DELETE ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+    f"AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+)
+SQLITE_REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+POSTGRESQL_NAME_VECTOR = f"to_tsvector('simple', {TITLE_TABLE}.name)"
+POSTGRESQL_FULL_VECTOR = (
+    f"(setweight(to_tsvector('simple', {TITLE_TABLE}.name), 'A') || "
+    f"setweight(to_tsvector('simple', {TITLE_TABLE}.description), 'B'))"
+)
+POSTGRESQL_INDEX_SQL = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    f'CREATE INDEX IF NOT EXISTS reviews_title_name_trgm_idx '
+    f'ON {TITLE_TABLE} USING gin (name gin_trgm_ops)',
+    f'CREATE INDEX IF NOT EXISTS reviews_title_name_tsv_idx '
+    f'ON {TITLE_TABLE} USING gin (({POSTGRESQL_NAME_VECTOR}))',
+    f'CREATE INDEX IF NOT EXISTS reviews_title_full_tsv_idx '
+    f'ON {TITLE_TABLE} USING gin (({POSTGRESQL_FULL_VECTOR}))',
+)
+
+
+def install_search_index(connection):
+    """Создаёт поисковый индекс произведений для текущей СУБД.
+
+    В SQLite индекс FTS5 синхронизируется с таблицей произведений
+    триггерами, в PostgreSQL используются индексы по выражениям,
+    которые СУБД поддерживает сама.
+    """
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE %s",
+                (f'{FTS_TABLE}_a_',)
+            )
+            complete = cursor.fetchone()[0] == 3
+            for sql in SQLITE_INDEX_SQL:
+                cursor.execute(sql)
+            if not complete:
+                cursor.execute(SQLITE_REBUILD_SQL)
+        elif connection.vendor == 'postgresql':
+            for sql in POSTGRESQL_INDEX_SQL:
+                cursor.execute(sql)
+
+
+def restore_search_index(sender, using, **kwargs):
+    """Восстанавливает триггеры индекса после миграций.
+
+    SQLite при изменении схемы пересоздаёт таблицу произведений, и её
+    триггеры удаляются вместе со старой таблицей.
+    """
+
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    applied = MigrationRecorder(connection).migration_qs.filter(
+        app='reviews', name=SEARCH_INDEX_MIGRATION
+    )
+    if applied.exists():
+        install_search_index(connection)
+
+
+def search_titles(queryset, query, include_description=None):
+    """Отбирает произведения по запросу и сортирует их по релевантности.
+
+    Каждое слово запроса ищется как префикс, все слова должны найтись.
+    Поле `search_rank` тем больше, чем лучше произведение подходит
+    под запрос.
+    """
+
+    tokens = TOKEN_PATTERN.findall(query.lower())
+    if not tokens:
+        return queryset
+    if include_description is None:
+        include_description = settings.TITLE_SEARCH_INCLUDE_DESCRIPTION
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        queryset = _sqlite_search(queryset, tokens, include_description)
+    elif vendor == 'postgresql':
+        queryset = _postgresql_search(queryset, tokens, include_description)
+    else:
+        return _fallback_search(queryset, tokens, include_description)
+    return queryset.order_by('-search_rank', 'id')
+
+
+def _sqlite_search(queryset, tokens, include_description):
+    phrases = [f'"{token}"*' for token in tokens]
+    if not include_description:
+        phrases = [f'name : {phrase}' for phrase in phrases]
+    match = ' AND '.join(phrases)
+    return queryset.filter(
+        id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,)
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {TITLE_TABLE}.id',
+            (match,),
+            output_field=FloatField()
+        )
+    )
+
+
+def _postgresql_search(queryset, tokens, include_description):
+    vector = (
+        POSTGRESQL_FULL_VECTOR if include_description
+        else POSTGRESQL_NAME_VECTOR
+    )
+    tsquery = ' & '.join(f'{token}:*' for token in tokens)
+    text = ' '.join(tokens)
+    return queryset.filter(
+        id__in=RawSQL(
+            f'SELECT id FROM {TITLE_TABLE} '
+            f"WHERE {vector} @@ to_tsquery('simple', %s) OR name %% %s",
+            (tsquery, text)
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f"ts_rank({vector}, to_tsquery('simple', %s)) "
+            f'+ similarity({TITLE_TABLE}.name, %s)',
+            (tsquery, text),
+            output_field=FloatField()
+        )
+    )
+
+
+def _fallback_search(queryset, tokens, include_description):
+    for token in tokens:
+        condition = Q(name__icontains=token)
+        if include_description:
+            condition |= Q(description__icontains=token)
+        queryset = queryset.filter(condition)
+    return queryset
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .counters import update_comment_count, update_title_rating
+from .models import Comment, Review
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, raw, **kwargs):
+    """Запоминает прежнюю оценку и произведение редактируемого отзыва."""
+
+    instance._previous_rating = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_rating = (
+        Review.objects
+        .filter(pk=instance.pk)
+        .values_list('title_id', 'score')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def apply_review_score(sender, instance, created, raw, **kwargs):
+    """Учитывает оценку нового или изменённого отзыва в рейтинге."""
+
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if created or previous is None:
+        update_title_rating(instance.title_id, instance.score, 1)
+        return
+    title_id, score = previous
+    if title_id != instance.title_id:
+        update_title_rating(title_id, -score, -1)
+        update_title_rating(instance.title_id, instance.score, 1)
+    elif score != instance.score:
+        update_title_rating(title_id, instance.score - score, 0)
+
+
+@receiver(post_delete, sender=Review)
+def discard_review_score(sender, instance, **kwargs):
+    """Исключает оценку удалённого отзыва из рейтинга."""
+
+    update_title_rating(instance.title_id, -instance.score, -1)
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, raw, **kwargs):
+    """Увеличивает счётчик комментариев отзыва."""
+
+    if created and not raw:
+        update_comment_count(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def discount_comment(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев отзыва."""
+
+    update_comment_count(instance.review_id, -1)
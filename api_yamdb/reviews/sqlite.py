@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+
+# Прагмы, которые можно задать в профиле, в порядке применения:
+# busy_timeout идёт первой, чтобы переключение журнала в WAL ждало
+# блокировки других процессов, а не падало с «database is locked».
+PRAGMAS = (
+    'busy_timeout', 'journal_mode', 'synchronous', 'mmap_size',
+    'cache_size', 'temp_store',
+)
+
+
+def get_profile():
+    """Прагмы профиля `settings.SQLITE_PROFILE`."""
+
+    try:
+        return settings.SQLITE_PROFILES[settings.SQLITE_PROFILE]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f'Неизвестный профиль SQLite {settings.SQLITE_PROFILE!r}, '
+            f'доступны: {", ".join(settings.SQLITE_PROFILES)}.'
+        )
+
+
+def pragma_statements(profile):
+    """SQL для прагм профиля.
+
+    Значения подставляются в SQL, поэтому разрешены только известные
+    прагмы, целые числа и слова вроде `WAL` или `MEMORY`.
+    """
+
+    unknown = set(profile) - set(PRAGMAS)
+    if unknown:
+        raise ImproperlyConfigured(
+            f'Неизвестные прагмы SQLite: {", ".join(sorted(unknown))}.'
+        )
+    statements = []
+    for name in PRAGMAS:
+        if name not in profile:
+            continue
+        value = profile[name]
+        if not isinstance(value, int) and not str(value).isalpha():
+            raise ImproperlyConfigured(
+                f'Недопустимое значение прагмы SQLite {name}: {value!r}.'
+            )
+        statements.append(f'PRAGMA {name} = {value}')
+    return statements
+
+
+def apply_pragmas(connection, profile):
+    """Применяет профиль к соединению DB-API с SQLite."""
+
+    cursor = connection.cursor()
+    try:
+        for statement in pragma_statements(profile):
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Обработчик `connection_created`: настраивает соединения SQLite."""
+
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection.connection, get_profile())
+
+
+@contextmanager
+def immediate_atomic(using=None):
+    """`transaction.atomic`, которая в SQLite начинается с BEGIN IMMEDIATE.
+
+    Обычная транзакция SQLite берёт блокировку записи только на первой
+    записи. Если до этого она читала, а другое соединение успело
+    зафиксировать изменения, запись сразу падает с «database is locked»,
+    не дожидаясь busy_timeout. BEGIN IMMEDIATE берёт блокировку записи
+    до чтения, и транзакция ждёт её как обычно. В других СУБД и внутри
+    уже открытой транзакции это обычная `atomic`.
+    """
+
+    connection = transaction.get_connection(using)
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+    connection._start_transaction_under_autocommit = (
+        lambda: connection.cursor().execute('BEGIN IMMEDIATE')
+    )
+    try:
+        with transaction.atomic(using=using):
+            del connection._start_transaction_under_autocommit
+            yield
+    finally:
+        connection.__dict__.pop('_start_transaction_under_autocommit', None)
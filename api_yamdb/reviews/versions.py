@@ -0,0 +1,169 @@
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+
+from .models import (Category, Comment, DataVersion, Genre, GenreTitle,
+                     Review, Title, User)
+
+
+VERSION_TABLE = DataVersion._meta.db_table
+VERSIONS_MIGRATION = '0010_data_version'
+CATALOGUE = 'catalogue'
+AUTHORS = 'authors'
+
+TITLE_TABLE = Title._meta.db_table
+REVIEW_TABLE = Review._meta.db_table
+COMMENT_TABLE = Comment._meta.db_table
+
+
+def bump(name):
+    return (
+        f'INSERT INTO {VERSION_TABLE} (name, version, changed) '
+        f"VALUES ('{name}', 1, {{now}}) ON CONFLICT (name) DO UPDATE "
+        f'SET version = {VERSION_TABLE}.version + 1, changed = {{now}}'
+    )
+
+
+def touch(table, condition):
+    return f'UPDATE {table} SET updated = {{now}} WHERE {condition}'
+
+
+# Триггеры версий: таблица, событие и SQL, где {now} — текущее время.
+# Строки, которые видны в ответах API, получают новое время `updated`.
+# Удаление строки или её перенос к другому родителю обновляют `updated`
+# родителя. Общие строки версий меняются только при записях
+# администраторов и при смене имени пользователя.
+VERSION_TRIGGERS = (
+    (TITLE_TABLE, 'INSERT', (bump(CATALOGUE),)),
+    (TITLE_TABLE, 'DELETE', (bump(CATALOGUE),)),
+    (
+        TITLE_TABLE,
+        'UPDATE OF name, year, description, category_id, rating, '
+        'rating_count',
+        (touch(TITLE_TABLE, 'id = NEW.id'),),
+    ),
+    (GenreTitle._meta.db_table, 'INSERT', (
+        touch(TITLE_TABLE, 'id = NEW.title_id'),
+    )),
+    (GenreTitle._meta.db_table, 'DELETE', (
+        touch(TITLE_TABLE, 'id = OLD.title_id'),
+    )),
+    (GenreTitle._meta.db_table, 'UPDATE OF genre_id, title_id', (
+        touch(TITLE_TABLE, 'id IN (OLD.title_id, NEW.title_id)'),
+    )),
+    (Category._meta.db_table, 'INSERT', (bump(CATALOGUE),)),
+    (Category._meta.db_table, 'UPDATE', (bump(CATALOGUE),)),
+    (Category._meta.db_table, 'DELETE', (bump(CATALOGUE),)),
+    (Genre._meta.db_table, 'INSERT', (bump(CATALOGUE),)),
+    (Genre._meta.db_table, 'UPDATE', (bump(CATALOGUE),)),
+    (Genre._meta.db_table, 'DELETE', (bump(CATALOGUE),)),
+    (
+        REVIEW_TABLE,
+        'UPDATE OF title_id, author_id, text, score, pub_date, '
+        'comment_count',
+        (
+            touch(REVIEW_TABLE, 'id = NEW.id'),
+            touch(
+                TITLE_TABLE, 'id = OLD.title_id AND id <> NEW.title_id'
+            ),
+        ),
+    ),
+    (REVIEW_TABLE, 'DELETE', (touch(TITLE_TABLE, 'id = OLD.title_id'),)),
+    (
+        COMMENT_TABLE,
+        'UPDATE OF review_id, author_id, text, pub_date',
+        (
+            touch(COMMENT_TABLE, 'id = NEW.id'),
+            touch(
+                REVIEW_TABLE, 'id = OLD.review_id AND id <> NEW.review_id'
+            ),
+        ),
+    ),
+    (COMMENT_TABLE, 'DELETE', (touch(REVIEW_TABLE, 'id = OLD.review_id'),)),
+    # Из данных пользователя в ответы API попадает только имя автора.
+    (User._meta.db_table, 'UPDATE OF username', (bump(AUTHORS),)),
+)
+
+
+def trigger_name(table, event):
+    return f'{table}_version_{event.split()[0].lower()}'
+
+
+def sqlite_trigger_sql(table, event, statements):
+    now = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+    body = ' '.join(
+        f'{statement.format(now=now)};' for statement in statements
+    )
+    return (
+        f'CREATE TRIGGER IF NOT EXISTS {trigger_name(table, event)} '
+        f'AFTER {event} ON {table} BEGIN {body} END',
+    )
+
+
+def postgresql_trigger_sql(table, event, statements):
+    trigger = trigger_name(table, event)
+    body = ' '.join(
+        f'{statement.format(now="clock_timestamp()")};'
+        for statement in statements
+    )
+    return (
+        f'CREATE OR REPLACE FUNCTION {trigger}() RETURNS trigger AS $$ '
+        f'BEGIN {body} RETURN NULL; END $$ LANGUAGE plpgsql',
+        f'DROP TRIGGER IF EXISTS {trigger} ON {table}',
+        f'CREATE TRIGGER {trigger} AFTER {event} ON {table} '
+        f'FOR EACH ROW EXECUTE PROCEDURE {trigger}()',
+    )
+
+
+def install_version_triggers(connection):
+    """Создаёт триггеры, которые обновляют версии данных.
+
+    Триггеры срабатывают в той же транзакции, что и запись, поэтому
+    новую версию видно ровно тогда, когда видны новые данные. Запись
+    отзыва или комментария меняет только свою строку и строку родителя,
+    которую и так обновляют счётчики, так что общих для всех записей
+    строк на этом пути нет.
+    """
+
+    build = {
+        'sqlite': sqlite_trigger_sql,
+        'postgresql': postgresql_trigger_sql,
+    }.get(connection.vendor)
+    if build is None:
+        return
+    with connection.cursor() as cursor:
+        for table, event, statements in VERSION_TRIGGERS:
+            for sql in build(table, event, statements):
+                cursor.execute(sql)
+
+
+def versions_applied(connection):
+    return MigrationRecorder(connection).migration_qs.filter(
+        app='reviews', name=VERSIONS_MIGRATION
+    ).exists()
+
+
+def restore_version_triggers(sender, using, **kwargs):
+    """Восстанавливает триггеры версий после миграций.
+
+    SQLite при изменении схемы пересоздаёт таблицу, и её триггеры
+    удаляются вместе со старой таблицей.
+    """
+
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and versions_applied(connection):
+        install_version_triggers(connection)
+
+
+def restore_shared_versions(sender, using, **kwargs):
+    """Создаёт общие строки версий, если их нет.
+
+    Команда `flush` очищает и таблицу версий, а без строки версии
+    список считается отсутствующим и не получает валидаторов. После
+    `flush`, как и после миграций, отправляется `post_migrate`.
+    """
+
+    if versions_applied(connections[using]):
+        DataVersion.objects.using(using).bulk_create(
+            [DataVersion(name=CATALOGUE), DataVersion(name=AUTHORS)],
+            ignore_conflicts=True,
+        )
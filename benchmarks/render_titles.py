@@ -0,0 +1,97 @@
+"""Сравнение JSON-рендереров и парсеров на страницах произведений.
+
+Запуск из корня репозитория:
+
+    python benchmarks/render_titles.py [--pages 100 1000] [--repeat 20]
+
+Произведения создаются в памяти без БД, поэтому замеряется только
+кодирование и разбор JSON, а не запросы.
+"""
+import argparse
+import os
+import sys
+import timeit
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.renderers import FastJSONParser, FastJSONRenderer  # noqa: E402
+from api.serializers import GetTitleSerializer  # noqa: E402
+from reviews.models import Category, Genre, Title  # noqa: E402
+
+
+def make_titles(count):
+    categories = [
+        Category(id=idx, name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(10)
+    ]
+    genres = [
+        Genre(id=idx, name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(20)
+    ]
+    titles = []
+    for idx in range(count):
+        title = Title(
+            id=idx,
+            name=f'Произведение номер {idx}',
+            year=1900 + idx % 120,
+            description='Описание произведения. ' * 5,
+            category=categories[idx % len(categories)],
+            rating=idx % 10 + 0.5,
+            rating_count=idx % 50,
+        )
+        title._prefetched_objects_cache = {
+            'genre': genres[idx % 17:idx % 17 + 3]
+        }
+        titles.append(title)
+    return titles
+
+
+def measure(function, repeat):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'{"строк":>6} {"операция":<8} {"DRF, мс":>9} {"fast, мс":>9} '
+          f'{"ускорение":>9}')
+    for size in args.pages:
+        data = GetTitleSerializer(make_titles(size), many=True).data
+        body = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == body
+        assert FastJSONParser().parse(BytesIO(body)) == (
+            JSONParser().parse(BytesIO(body))
+        )
+        for name, slow, fast in (
+            (
+                'render',
+                lambda: JSONRenderer().render(data),
+                lambda: FastJSONRenderer().render(data),
+            ),
+            (
+                'parse',
+                lambda: JSONParser().parse(BytesIO(body)),
+                lambda: FastJSONParser().parse(BytesIO(body)),
+            ),
+        ):
+            slow_time = measure(slow, args.repeat)
+            fast_time = measure(fast, args.repeat)
+            print(f'{size:>6} {name:<8} {slow_time * 1000:>9.2f} '
+                  f'{fast_time * 1000:>9.2f} {slow_time / fast_time:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
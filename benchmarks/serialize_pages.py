@@ -0,0 +1,93 @@
+"""Сравнение сериализаторов DRF с быстрыми сериализаторами для чтения.
+
+Запуск из корня репозитория:
+
+    python benchmarks/serialize_pages.py [--pages 100 1000] [--repeat 20]
+
+Объекты создаются в памяти без БД, поэтому замеряется только
+преобразование объектов в словари.
+"""
+import argparse
+import datetime
+
+from django.utils import timezone
+
+from render_titles import make_titles, measure
+
+from api.read_serializers import fast_read_serializer
+from api.serializers import GetTitleSerializer, ReviewSerialiser
+from reviews.models import Review, User
+
+
+def make_reviews(count):
+    authors = [User(id=idx, username=f'author{idx}') for idx in range(50)]
+    published = datetime.datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Review(
+            id=idx,
+            author=authors[idx % len(authors)],
+            text='Текст отзыва. ' * 10,
+            score=idx % 10 + 1,
+            pub_date=published + datetime.timedelta(minutes=idx),
+            comment_count=idx % 7,
+        )
+        for idx in range(count)
+    ]
+
+
+def review_values(reviews):
+    return [
+        {
+            'id': review.id,
+            'author__username': review.author.username,
+            'score': review.score,
+            'text': review.text,
+            'pub_date': review.pub_date,
+            'comment_count': review.comment_count,
+        }
+        for review in reviews
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'{"строк":>6} {"сериализатор":<24} {"DRF, мс":>9} '
+          f'{"fast, мс":>9} {"ускорение":>9}')
+    for size in args.pages:
+        reviews = make_reviews(size)
+        for name, serializer_class, rows, fast_class, fast_rows in (
+            (
+                'GetTitleSerializer', GetTitleSerializer, make_titles(size),
+                fast_read_serializer(GetTitleSerializer), None,
+            ),
+            (
+                'ReviewSerialiser', ReviewSerialiser, reviews,
+                fast_read_serializer(ReviewSerialiser), None,
+            ),
+            (
+                'ReviewSerialiser/values', ReviewSerialiser, reviews,
+                fast_read_serializer(ReviewSerialiser, True),
+                review_values(reviews),
+            ),
+        ):
+            fast_rows = rows if fast_rows is None else fast_rows
+            assert fast_class(fast_rows, many=True).data == (
+                serializer_class(rows, many=True).data
+            )
+            slow_time = measure(
+                lambda: serializer_class(rows, many=True).data, args.repeat
+            )
+            fast_time = measure(
+                lambda: fast_class(fast_rows, many=True).data, args.repeat
+            )
+            print(f'{size:>6} {name:<24} '
+                  f'{slow_time * 1000:>9.2f} {fast_time * 1000:>9.2f} '
+                  f'{slow_time / fast_time:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
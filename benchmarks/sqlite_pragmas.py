@@ -0,0 +1,132 @@
+"""Пропускная способность SQLite с профилями прагм из настроек.
+
+Запуск из корня репозитория:
+
+    python benchmarks/sqlite_pragmas.py [--readers 4] [--writers 1]
+                                        [--seconds 3] [--rows 50000]
+
+Для каждого профиля из `settings.SQLITE_PROFILES` создаётся временная
+БД с таблицей отзывов. Отдельные процессы, как воркеры WSGI-сервера,
+пишут по одному отзыву за транзакцию и читают средние оценки
+произведений. Соединения открываются с тем же таймаутом, что у Django.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from reviews.sqlite import apply_pragmas  # noqa: E402
+
+TITLES = 1000
+SCHEMA = (
+    'CREATE TABLE review (id INTEGER PRIMARY KEY, title_id INTEGER, '
+    'author_id INTEGER, text TEXT, score INTEGER, pub_date TEXT)',
+    'CREATE INDEX review_title_idx ON review (title_id)',
+)
+INSERT_SQL = (
+    'INSERT INTO review (title_id, author_id, text, score, pub_date) '
+    "VALUES (?, ?, ?, ?, datetime('now'))"
+)
+READ_SQL = (
+    'SELECT count(*), avg(score) FROM review WHERE title_id = ?'
+)
+
+
+def connect(path, profile):
+    database = sqlite3.connect(path, timeout=5, isolation_level=None)
+    apply_pragmas(database, profile)
+    return database
+
+
+def create_database(path, profile, rows):
+    database = connect(path, profile)
+    for statement in SCHEMA:
+        database.execute(statement)
+    database.execute('BEGIN')
+    database.executemany(INSERT_SQL, (
+        (idx % TITLES, idx % 500, 'Текст отзыва. ' * 10, idx % 10 + 1)
+        for idx in range(rows)
+    ))
+    database.execute('COMMIT')
+    database.close()
+
+
+def work(path, profile, kind, seconds, results):
+    database = connect(path, profile)
+    random.seed(os.getpid())
+    done = errors = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        title_id = random.randrange(TITLES)
+        try:
+            if kind == 'write':
+                database.execute(INSERT_SQL, (title_id, 1, 'Новый', 7))
+            else:
+                database.execute(READ_SQL, (title_id,)).fetchall()
+            done += 1
+        except sqlite3.OperationalError:
+            errors += 1
+    database.close()
+    results.put((kind, done, errors))
+
+
+def run(profile, args):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'db.sqlite3')
+        create_database(path, profile, args.rows)
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=work,
+                args=(path, profile, kind, args.seconds, results)
+            )
+            for kind in ['write'] * args.writers + ['read'] * args.readers
+        ]
+        for worker in workers:
+            worker.start()
+        totals = {'write': [0, 0], 'read': [0, 0]}
+        for _ in workers:
+            kind, done, errors = results.get()
+            totals[kind][0] += done
+            totals[kind][1] += errors
+        for worker in workers:
+            worker.join()
+    return {
+        kind: (done / args.seconds, errors)
+        for kind, (done, errors) in totals.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=1)
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--rows', type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f'{"профиль":<10} {"запись/с":>10} {"ошибок":>7} '
+          f'{"чтение/с":>10} {"ошибок":>7}')
+    for name, profile in settings.SQLITE_PROFILES.items():
+        totals = run(profile, args)
+        print(f'{name:<10} {totals["write"][0]:>10.0f} '
+              f'{totals["write"][1]:>7} {totals["read"][0]:>10.0f} '
+              f'{totals["read"][1]:>7}')
+
+
+if __name__ == '__main__':
+    main()
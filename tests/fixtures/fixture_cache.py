@@ -0,0 +1,20 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def revocation_cache(settings, tmp_path):
+    settings.CACHES = {
+        **settings.CACHES,
+        settings.AUTH_REVOCATION_CACHE_ALIAS: {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': tmp_path / 'revocations',
+        },
+    }
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def sync_outbox(settings):
+    # Письма отправляются в том же запросе, чтобы тесты видели их в
+    # `mail.outbox` сразу после ответа.
+    settings.EMAIL_OUTBOX_MODE = 'sync'
@@ -1,8 +1,15 @@
 from http import HTTPStatus
 
 import pytest
+from django.db import connection
 from django.db.utils import IntegrityError
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
 
+from api.authentication import RoleRefreshToken
+from api.serializers import REVIEW_COUNT_ERROR, ReviewSerialiser
+from reviews.models import Title, User
 from tests.utils import (
     check_fields, check_pagination, create_reviews, create_single_review,
     create_titles
@@ -413,3 +420,49 @@ class Test05ReviewAPI:
             f'Проверьте, что PUT-запрос к `{self.REVIEW_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_duplicate_review_without_extra_query(self, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        user_client = APIClient()
+        user_client.credentials(HTTP_AUTHORIZATION=(
+            f'Bearer {RoleRefreshToken.for_user(user).access_token}'
+        ))
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'text', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        assert not [sql for sql in selects if 'FROM "reviews_review"' in sql], (
+            'Проверьте, что перед созданием отзыва не выполняется отдельный '
+            'запрос на поиск отзыва того же автора.'
+        )
+        assert not [sql for sql in selects if 'FROM "reviews_user"' in sql], (
+            'Проверьте, что автор отзыва берётся из токена, без запроса '
+            'пользователя из БД.'
+        )
+
+        response = user_client.post(url, data={'text': 'text', 'score': 7})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': [REVIEW_COUNT_ERROR]
+        }, (
+            'Проверьте, что повторный отзыв на то же произведение '
+            'отклоняется с прежним сообщением об ошибке.'
+        )
+
+    def test_08_other_integrity_errors_are_raised(self, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        request = Request(APIRequestFactory().post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        ))
+        request.user = user
+        serializer = ReviewSerialiser(
+            data={'text': 'text', 'score': 5}, context={'request': request}
+        )
+        assert serializer.is_valid(), serializer.errors
+        with pytest.raises(IntegrityError):
+            serializer.save(author=User(pk=user.pk + 1000), title=title)
@@ -0,0 +1,135 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.fixture
+    def title(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        return Title.objects.create(
+            name='Терминатор', year=1984, category=category
+        )
+
+    def get_rating(self, client, title):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        )
+        return response.json()['rating']
+
+    def test_01_rating_follows_reviews(self, client, title, user, admin):
+        review = Review.objects.create(
+            title=title, author=user, text='text', score=10
+        )
+        Review.objects.create(title=title, author=admin, text='text', score=5)
+        assert self.get_rating(client, title) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'добавлении отзыва.'
+        )
+
+        review.score = 1
+        review.save()
+        assert self.get_rating(client, title) == 3, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        review.delete()
+        assert self.get_rating(client, title) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_recount_ratings(self, client, title, user):
+        Review.objects.create(title=title, author=user, text='text', score=8)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        assert self.get_rating(client, title) is None
+
+        call_command('recount', stdout=StringIO())
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (8, 1), (
+            'Проверьте, что команда `recount` восстанавливает '
+            'сумму и количество оценок произведения.'
+        )
+        assert self.get_rating(client, title) == 8, (
+            'Проверьте, что после `recount` API не отдаёт устаревший '
+            'рейтинг из кеша.'
+        )
+
+    def test_03_ordering(self, client, title, user, admin):
+        second = Title.objects.create(name='Алиса', year=1865)
+        Review.objects.create(title=title, author=user, text='text', score=9)
+        Review.objects.create(title=title, author=admin, text='text', score=7)
+        Review.objects.create(title=second, author=user, text='text', score=4)
+
+        for ordering, expected in (
+            ('-rating', [title.id, second.id]),
+            ('rating', [second.id, title.id]),
+            ('name', [second.id, title.id]),
+            ('-year', [title.id, second.id]),
+        ):
+            response = client.get(f'/api/v1/titles/?ordering={ordering}')
+            ids = [item['id'] for item in response.json()['results']]
+            assert ids == expected, (
+                'Проверьте, что эндпоинт `/api/v1/titles/` поддерживает '
+                f'сортировку `ordering={ordering}` и не дублирует '
+                'произведения в выдаче.'
+            )
+
+    def test_04_review_and_comment_counts(self, client, user_client, title,
+                                          user, admin):
+        review = Review.objects.create(
+            title=title, author=admin, text='text', score=8
+        )
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert response.json()['review_count'] == 1, (
+            'Проверьте, что в ответе о произведении есть количество отзывов '
+            '`review_count`.'
+        )
+
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(reviews_url)['ETag']
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        for text in ('Первый', 'Второй'):
+            assert user_client.post(
+                comments_url, {'text': text}
+            ).status_code == 201
+        Comment.objects.filter(text='Второй').delete()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['results'][0]['comment_count'] == 1, (
+            'Проверьте, что количество комментариев отзыва `comment_count` '
+            'обновляется при добавлении и удалении комментариев.'
+        )
+
+    def test_05_recount(self, client, title, user):
+        review = Review.objects.create(
+            title=title, author=user, text='text', score=8
+        )
+        Comment.objects.create(review=review, author=user, text='text')
+        Title.objects.update(rating_count=5)
+        Review.objects.update(comment_count=7)
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(reviews_url)['ETag']
+
+        call_command('recount', stdout=StringIO())
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после `recount` меняется `ETag` списка отзывов.'
+        )
+        assert response.json()['results'][0]['comment_count'] == 1
+        title.refresh_from_db()
+        review.refresh_from_db()
+        assert (title.rating_count, review.comment_count) == (1, 1), (
+            'Проверьте, что команда `recount` восстанавливает количество '
+            'отзывов и комментариев.'
+        )
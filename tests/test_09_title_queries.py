@@ -0,0 +1,157 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def create_titles(self, count, genres_per_title):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(genres_per_title)
+        ]
+        titles = []
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+            titles.append(title)
+        return titles
+
+    def count_queries(self, client, url):
+        # Первый запрос к ресурсу создаёт строки его версий; другой
+        # параметр не даёт ответу на следующий запрос попасть в кеш.
+        client.get(url, {'warmup': 1})
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        return len(context.captured_queries)
+
+    def test_01_list_queries_do_not_grow(self, client):
+        self.create_titles(count=1, genres_per_title=1)
+        single = self.count_queries(client, self.TITLES_URL)
+        Title.objects.all().delete()
+        Category.objects.all().delete()
+        Genre.objects.all().delete()
+
+        self.create_titles(count=5, genres_per_title=3)
+        many = self.count_queries(client, self.TITLES_URL)
+        assert many == single, (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от количества произведений на '
+            f'странице и их жанров: {single} для одного и {many} для пяти.'
+        )
+
+    def test_02_detail_queries_do_not_grow(self, client):
+        title, = self.create_titles(count=1, genres_per_title=1)
+        single = self.count_queries(
+            client, self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        )
+        title.genre.set([
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'extra-{idx}')
+            for idx in range(4)
+        ])
+        many = self.count_queries(
+            client, self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert many == single, (
+            'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` не зависит от количества '
+            'жанров произведения.'
+        )
+
+    def test_03_batch(self, client, settings):
+        titles = self.create_titles(count=30, genres_per_title=2)
+        ids = [titles[5].id, titles[1].id, 10 ** 6, titles[20].id]
+        url = f'{self.TITLES_URL}batch/?ids=' + ','.join(map(str, ids))
+        client.get(f'{self.TITLES_URL}batch/?ids={ids[0]}')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        few = len(context.captured_queries)
+        assert response.status_code == 200
+        data = response.json()
+        assert [item['id'] for item in data] == [
+            titles[5].id, titles[1].id, titles[20].id
+        ], (
+            'Проверьте, что `/api/v1/titles/batch/?ids=` возвращает '
+            'найденные произведения в порядке запроса.'
+        )
+        assert data[0] == client.get(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[5].id)
+        ).json(), (
+            'Проверьте, что произведения из `/api/v1/titles/batch/` '
+            'сериализуются так же, как в ответе об одном произведении.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(f'{self.TITLES_URL}batch/?ids=' + ','.join(
+                str(title.id) for title in titles
+            ))
+        assert len(context.captured_queries) == few, (
+            'Проверьте, что количество запросов к БД в '
+            '`/api/v1/titles/batch/` не зависит от количества id.'
+        )
+
+        settings.TITLE_BATCH_MAX_IDS = 2
+        for query in ('', 'a,b', '1,2,3'):
+            assert client.get(
+                f'{self.TITLES_URL}batch/?ids={query}'
+            ).status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09NestedResourceQueries:
+
+    def parent_queries(self, context, table):
+        return [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{table}"' in query['sql']
+        ]
+
+    def test_01_parent_is_loaded_once(self, user_client, admin):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=admin, text='text', score=5
+        )
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        for method, url, data, table in (
+            ('get', reviews_url, {'count': 'estimate'}, 'reviews_title'),
+            ('post', reviews_url, {'text': 'text', 'score': 5},
+             'reviews_title'),
+            ('get', comments_url, None, 'reviews_review'),
+            ('post', comments_url, {'text': 'text'}, 'reviews_review'),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(user_client, method)(url, data)
+            assert response.status_code in (200, 201)
+            assert len(self.parent_queries(context, table)) <= 1, (
+                f'Проверьте, что {method.upper()}-запрос к `{url}` ищет '
+                'родительский объект в БД не больше одного раза.'
+            )
+
+    def test_02_missing_parent(self, user_client, admin):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=admin, text='text', score=5
+        )
+        other = Title.objects.create(name='Чужой', year=1979)
+        assert user_client.get(
+            f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+        ).status_code == 404, (
+            'Проверьте, что комментарии отзыва недоступны по адресу другого '
+            'произведения.'
+        )
+        assert user_client.post(
+            f'/api/v1/titles/{other.id + 1}/reviews/',
+            {'text': 'text', 'score': 5}
+        ).status_code == 404
@@ -0,0 +1,192 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Pagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def reviews(self, django_user_model):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        for idx in range(12):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'review {idx}', score=5
+            )
+        return title, list(title.reviews.order_by('pub_date', 'id'))
+
+    def test_01_cursor_pagination(self, client, reviews):
+        title, expected = reviews
+        url = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            + '?pagination=cursor'
+        )
+        ids = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации не выполняется '
+                'подсчёт общего количества отзывов.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        assert ids == [review.id for review in expected], (
+            'Проверьте, что курсорная пагинация отзывов возвращает все '
+            'отзывы по одному разу в порядке публикации.'
+        )
+
+    def test_02_page_number_is_default(self, client, reviews):
+        title, expected = reviews
+        data = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        ).json()
+        assert data['count'] == len(expected), (
+            'Проверьте, что по умолчанию отзывы разбиваются на страницы '
+            'по номеру страницы.'
+        )
+
+    def test_03_client_page_size(self, client, reviews):
+        title, expected = reviews
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        data = client.get(url, {'page_size': 10}).json()
+        assert len(data['results']) == 10, (
+            'Проверьте, что размер страницы задаётся параметром `page_size`.'
+        )
+        data = client.get(url, {'limit': 3}).json()
+        assert len(data['results']) == 3, (
+            'Проверьте, что размер страницы задаётся параметром `limit`.'
+        )
+        data = client.get(url, {'page_size': 0}).json()
+        assert len(data['results']) == 5, (
+            'Проверьте, что при некорректном `page_size` используется '
+            'размер страницы по умолчанию.'
+        )
+        data = client.get(
+            url, {'pagination': 'cursor', 'limit': 7}
+        ).json()
+        assert len(data['results']) == 7, (
+            'Проверьте, что `limit` работает и в курсорном режиме.'
+        )
+
+    def test_04_page_size_limits(self, client, settings, reviews):
+        title, expected = reviews
+        settings.API_MAX_PAGE_SIZE = 3
+        data = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            {'page_size': 1000}
+        ).json()
+        assert len(data['results']) == 3, (
+            'Проверьте, что размер страницы ограничивается настройкой '
+            '`API_MAX_PAGE_SIZE`.'
+        )
+        for idx in range(25):
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+        data = client.get('/api/v1/titles/').json()
+        assert len(data['results']) == 20, (
+            'Проверьте, что у представления произведений свой размер '
+            'страницы по умолчанию и ограничение.'
+        )
+
+    def test_05_without_count(self, client, reviews):
+        title, expected = reviews
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        ids = []
+        next_url = f'{url}?count=false&page_size=5'
+        while next_url:
+            data = client.get(next_url).json()
+            assert 'count' not in data, (
+                'Проверьте, что с `count=false` общее количество объектов '
+                'не подсчитывается.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            next_url = data['next']
+        assert sorted(ids) == sorted(review.id for review in expected), (
+            'Проверьте, что с `count=false` ссылки `next` проходят по всем '
+            'страницам.'
+        )
+        data = client.get(url, {'count': 'false', 'page': 3}).json()
+        assert data['previous'].endswith('count=false&page=2')
+        assert client.get(
+            url, {'count': 'false', 'page': 4}
+        ).status_code == 404
+
+    def test_06_estimated_count_from_counter(self, client, reviews):
+        title, expected = reviews
+        Title.objects.filter(pk=title.pk).update(rating_count=100)
+        data = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            {'count': 'estimate'}
+        ).json()
+        assert data['count'] == 100 and data['count_estimated'] is False, (
+            'Проверьте, что в режиме `count=estimate` количество отзывов '
+            'берётся из счётчика произведения.'
+        )
+
+    def test_07_estimated_count_from_statistics(self, client, settings):
+        for idx in range(3):
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            cursor.execute(
+                "UPDATE sqlite_stat1 SET stat = '50000 1' "
+                "WHERE tbl = 'reviews_title'"
+            )
+        try:
+            data = client.get('/api/v1/titles/', {'count': 'estimate'}).json()
+            assert data['count'] == 50000 and data['count_estimated'], (
+                'Проверьте, что в режиме `count=estimate` для больших таблиц '
+                'используется статистика БД и ответ помечается как оценка.'
+            )
+            settings.API_ESTIMATED_COUNT_THRESHOLD = 10 ** 6
+            data = client.get(
+                '/api/v1/titles/', {'count': 'estimate', 'page': 1}
+            ).json()
+            assert data['count'] == 3 and not data['count_estimated'], (
+                'Проверьте, что ниже порога количество считается точно.'
+            )
+            data = client.get(
+                '/api/v1/titles/', {'count': 'estimate', 'year': 2000}
+            ).json()
+            assert data['count'] == 3 and not data['count_estimated']
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM sqlite_stat1')
+
+    def test_08_estimated_comment_count_from_counter(self, client, reviews):
+        title, expected = reviews
+        review = expected[0]
+        Review.objects.filter(pk=review.pk).update(comment_count=40)
+        data = client.get(
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)}'
+            f'{review.id}/comments/',
+            {'count': 'estimate'}
+        ).json()
+        assert data['count'] == 40 and data['count_estimated'] is False, (
+            'Проверьте, что в режиме `count=estimate` количество '
+            'комментариев берётся из счётчика отзыва.'
+        )
+
+    def test_09_count_without_join(self, client, reviews):
+        title, expected = reviews
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+                {'count': 'exact'}
+            ).json()
+        assert data['count'] == len(expected)
+        assert data['results'][0]['author'] == expected[0].author.username
+        counts = [
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(' in query['sql']
+        ]
+        assert len(counts) == 1 and 'JOIN' not in counts[0], (
+            'Проверьте, что общее количество отзывов считается без JOIN '
+            'с таблицей пользователей.'
+        )
@@ -0,0 +1,108 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == 200
+        return [item['name'] for item in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client):
+        Title.objects.create(
+            name='Мост через реку Квай', year=1957,
+            description='Военная драма'
+        )
+        Title.objects.create(
+            name='Крёстный отец', year=1972, description='Мост не упоминается'
+        )
+        Title.objects.create(name='Титаник', year=1997)
+
+        assert self.search(client, 'мост') == [
+            'Мост через реку Квай', 'Крёстный отец'
+        ], (
+            'Проверьте, что поиск по `search` находит произведения по '
+            'названию и описанию, а совпадения в названии идут первыми.'
+        )
+        assert self.search(client, 'тит') == ['Титаник'], (
+            'Проверьте, что поиск по `search` учитывает начало слова.'
+        )
+        assert self.search(client, 'мост драма') == [
+            'Мост через реку Квай'
+        ], (
+            'Проверьте, что поиск по `search` требует совпадения всех слов.'
+        )
+
+    def test_02_index_follows_title_changes(self, client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        title.name = 'Чужой'
+        title.save()
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'чужой') == ['Чужой']
+
+        title.delete()
+        assert self.search(client, 'чужой') == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении и '
+            'удалении произведений.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        horror = Genre.objects.create(name='Ужасы', slug='horror')
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        titles = [
+            Title.objects.create(name='Первое', year=1950, category=films),
+            Title.objects.create(name='Второе', year=1980, category=books),
+            Title.objects.create(name='Третье', year=2000, category=films),
+        ]
+        titles[0].genre.set([drama, comedy])
+        titles[1].genre.set([comedy])
+        titles[2].genre.set([horror])
+        return titles
+
+    def filter(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == 200
+        return {item['name'] for item in response.json()['results']}
+
+    def test_01_exact_and_multiple_slugs(self, client, titles):
+        assert self.filter(client, genre='drama,comedy') == {
+            'Первое', 'Второе'
+        }, (
+            'Проверьте, что фильтр `genre` принимает несколько slug через '
+            'запятую и не дублирует произведения.'
+        )
+        assert self.filter(client, genre='dram') == set(), (
+            'Проверьте, что фильтр `genre` сравнивает slug целиком.'
+        )
+        assert self.filter(client, category='books,films') == {
+            'Первое', 'Второе', 'Третье'
+        }
+        assert self.filter(client, category='film') == set(), (
+            'Проверьте, что фильтр `category` сравнивает slug целиком.'
+        )
+
+    def test_02_year_range(self, client, titles):
+        assert self.filter(client, year_min=1960, year_max=2000) == {
+            'Второе', 'Третье'
+        }, (
+            'Проверьте, что фильтры `year_min` и `year_max` отбирают '
+            'произведения по диапазону лет включительно.'
+        )
+        assert self.filter(client, year=198) == set(), (
+            'Проверьте, что фильтр `year` сравнивает год целиком.'
+        )
@@ -0,0 +1,74 @@
+import pytest
+
+from api.cache import response_cache_stats
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.fixture
+    def title(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        title = Title.objects.create(
+            name='Терминатор', year=1984, category=category
+        )
+        title.genre.add(Genre.objects.create(name='Ужасы', slug='horror'))
+        return title
+
+    def test_01_repeated_requests_hit_cache(self, client, title):
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        before = response_cache_stats()
+        first = client.get(url)
+        second = client.get(url)
+        after = response_cache_stats()
+        assert (first['X-Cache'], second['X-Cache']) == ('MISS', 'HIT'), (
+            'Проверьте, что повторный GET-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` отдаётся из кеша.'
+        )
+        assert first.json() == second.json()
+        assert after['hits'] == before['hits'] + 1
+        assert after['misses'] == before['misses'] + 1
+
+        assert client.get(self.TITLES_URL, {'year': 1984})['X-Cache'] == (
+            'MISS'
+        )
+        assert client.get(self.TITLES_URL, {'year': 1984})['X-Cache'] == (
+            'HIT'
+        )
+
+    def test_02_invalidation(self, client, title, user):
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        changes = (
+            lambda: Title.objects.filter(pk=title.pk).first().save(),
+            lambda: Review.objects.create(
+                title=title, author=user, text='text', score=5
+            ),
+            lambda: title.genre.add(
+                Genre.objects.create(name='Драма', slug='drama')
+            ),
+            lambda: Category.objects.filter(pk=title.category_id).first()
+            .save(),
+            lambda: Genre.objects.first().save(),
+        )
+        for change in changes:
+            client.get(url)
+            client.get(self.TITLES_URL)
+            change()
+            assert client.get(url)['X-Cache'] == 'MISS', (
+                'Проверьте, что кеш произведения сбрасывается при изменении '
+                'произведения, его отзывов, жанров и категорий.'
+            )
+            assert client.get(self.TITLES_URL)['X-Cache'] == 'MISS', (
+                'Проверьте, что кеш списка произведений сбрасывается при '
+                'изменении данных.'
+            )
+
+    def test_03_rating_is_fresh(self, client, title, user):
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        assert client.get(url).json()['rating'] is None
+        Review.objects.create(title=title, author=user, text='text', score=6)
+        assert client.get(url).json()['rating'] == 6
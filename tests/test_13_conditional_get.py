@@ -0,0 +1,179 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, DataVersion, Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    @pytest.fixture
+    def review(self, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=user, text='text', score=5
+        )
+        Comment.objects.create(review=review, author=user, text='comment')
+        return review
+
+    def urls(self, review):
+        title_id = review.title_id
+        return (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review.id}/',
+            f'/api/v1/titles/{title_id}/reviews/{review.id}/comments/',
+        )
+
+    def test_01_not_modified(self, client, review):
+        for url in self.urls(review):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.has_header('ETag'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок `ETag`.'
+            )
+            assert response.has_header('Last-Modified'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок `Last-Modified`.'
+            )
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(
+                    url, HTTP_IF_NONE_MATCH=response['ETag']
+                )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает ответ со статусом 304.'
+            )
+            assert len(context.captured_queries) == 1, (
+                f'Проверьте, что ответ 304 для `{url}` отдаётся после '
+                'одного запроса версий, без выборки данных.'
+            )
+
+    def test_02_changes_update_etag(self, client, review, admin):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        etag = client.get(url)['ETag']
+        Review.objects.create(
+            title_id=review.title_id, author=admin, text='text', score=7
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва `ETag` списка отзывов '
+            'меняется.'
+        )
+
+        url = (
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/comments/'
+        )
+        etag = client.get(url)['ETag']
+        comment = review.comments.first()
+        comment.text = 'changed'
+        comment.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения комментария `ETag` списка '
+            'комментариев меняется.'
+        )
+
+    def test_03_writes_without_signals(self, client, review):
+        changes = (
+            (
+                '/api/v1/titles/',
+                lambda: Title.objects.filter(pk=review.title_id).update(
+                    name='zzz'
+                ),
+            ),
+            (
+                f'/api/v1/titles/{review.title_id}/',
+                lambda: Title.objects.filter(pk=review.title_id).update(
+                    description='новое описание'
+                ),
+            ),
+            (
+                f'/api/v1/titles/{review.title_id}/reviews/',
+                lambda: Review.objects.filter(pk=review.pk).update(
+                    text='изменён'
+                ),
+            ),
+            (
+                f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+                'comments/',
+                lambda: Comment.objects.filter(review=review).delete(),
+            ),
+            (
+                f'/api/v1/titles/{review.title_id}/reviews/',
+                lambda: User.objects.filter(pk=review.author_id).update(
+                    username='renamed'
+                ),
+            ),
+        )
+        for url, change in changes:
+            etag = client.get(url)['ETag']
+            change()
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `ETag` ответа `{url}` меняется при '
+                'изменении данных через `QuerySet.update` и `delete`.'
+            )
+
+    def test_04_missing_resources(self, client, review):
+        versions = list(DataVersion.objects.values_list())
+        title_id = review.title_id
+        for url in (
+            '/api/v1/titles/100000/',
+            '/api/v1/titles/100000/reviews/',
+            f'/api/v1/titles/{"x" * 100}/',
+            f'/api/v1/titles/{title_id}/reviews/100000/',
+            f'/api/v1/titles/{title_id}/reviews/100000/comments/',
+            f'/api/v1/titles/100000/reviews/{review.id}/comments/',
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH='"etag"')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+                'со статусом 404.'
+            )
+        assert list(DataVersion.objects.values_list()) == versions, (
+            'Проверьте, что запросы на чтение не создают строк версий.'
+        )
+
+    def test_05_review_writes_skip_shared_versions(self, client, review,
+                                                   admin):
+        versions = list(DataVersion.objects.values_list())
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+        new = Review.objects.create(
+            title_id=review.title_id, author=admin, text='text', score=9
+        )
+        Comment.objects.create(review=new, author=admin, text='comment')
+        new.delete()
+        assert list(DataVersion.objects.values_list()) == versions, (
+            'Проверьте, что запись отзывов и комментариев не обновляет '
+            'общие строки версий.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` списка произведений меняется вместе '
+            'с рейтингом произведения.'
+        )
+
+    def test_06_shared_versions_after_flush(self, client):
+        call_command('flush', interactive=False, verbosity=0)
+        assert set(DataVersion.objects.values_list('name', flat=True)) == {
+            'catalogue', 'authors'
+        }, (
+            'Проверьте, что после `flush` общие строки версий создаются '
+            'заново.'
+        )
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            'Проверьте, что список произведений получает ETag и после '
+            'очистки БД.'
+        )
@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import RoleRefreshToken
+from reviews.models import Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14StatelessAuthentication:
+
+    USERS_URL = '/api/v1/users/'
+
+    def get_client(self, user):
+        client = APIClient()
+        token = RoleRefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def test_01_token_contains_role(self, admin):
+        client = APIClient()
+        admin.confirmation_code = 'code'
+        admin.save()
+        response = client.post(
+            '/api/v1/auth/token/',
+            data={'username': admin.username, 'confirmation_code': 'code'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/categories/', data={
+                'name': 'Фильм', 'slug': 'films'
+            })
+        assert response.status_code == HTTPStatus.CREATED
+        user_queries = [
+            query for query in context.captured_queries
+            if 'reviews_user' in query['sql']
+        ]
+        assert not user_queries, (
+            'Проверьте, что запрос с токеном, содержащим роль, не загружает '
+            'пользователя из БД.'
+        )
+
+    def test_02_demotion_is_applied(self, admin):
+        admin_client = self.get_client(admin)
+        assert admin_client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+        admin.role = 'user'
+        admin.save()
+        response = admin_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после понижения роли выданный ранее токен '
+            'больше не даёт прав администратора.'
+        )
+
+    def test_03_deleted_user_is_rejected(self, admin):
+        admin_client = self.get_client(admin)
+        admin.delete()
+        response = admin_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя отклоняется.'
+        )
+
+    @pytest.mark.parametrize('change', [
+        lambda admin: User.objects.filter(pk=admin.pk).update(role='user'),
+        lambda admin: User.objects.bulk_update(
+            [User(pk=admin.pk, role='user')], ['role']
+        ),
+    ], ids=['update', 'bulk_update'])
+    def test_04_bulk_demotion_is_applied(self, admin, change):
+        admin_client = self.get_client(admin)
+        assert admin_client.get(self.USERS_URL).status_code == HTTPStatus.OK
+        change(admin)
+        response = admin_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что понижение роли через `QuerySet.update` тоже '
+            'отзывает права администратора у выданного токена.'
+        )
+
+    def test_05_process_local_cache_loads_user(self, admin, settings):
+        settings.CACHES = {
+            **settings.CACHES,
+            settings.AUTH_REVOCATION_CACHE_ALIAS: {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            },
+        }
+        admin_client = self.get_client(admin)
+        with CaptureQueriesContext(connection) as context:
+            assert admin_client.get(self.USERS_URL).status_code == (
+                HTTPStatus.OK
+            )
+        assert any(
+            'FROM "reviews_user" WHERE "reviews_user"."id"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что без общего кеша отзыва прав пользователь '
+            'загружается из БД при каждом запросе.'
+        )
+        User.objects.filter(pk=admin.pk).update(role='user')
+        assert admin_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_06_author_can_edit_own_review(self, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        user_client = self.get_client(user)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, data={'text': 'text', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        response = user_client.patch(
+            f'{url}{response.json()["id"]}/', data={'score': 6}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор отзыва с токеном без обращения к БД '
+            'может изменить свой отзыв.'
+        )
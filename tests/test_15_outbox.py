@@ -0,0 +1,196 @@
+import threading
+import time
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+
+from reviews.models import EmailOutbox
+from reviews.outbox import claim, enqueue_email, send_pending
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class RefusedBackend(BaseEmailBackend):
+
+    def open(self):
+        raise ConnectionRefusedError('SMTP не принимает соединения')
+
+    def send_messages(self, email_messages):
+        raise AssertionError('Письма не отправляются без соединения.')
+
+
+class ConcurrentWriteBackend(EmailBackend):
+    # Пока письмо отправляется, другой поток пишет в БД.
+
+    in_transaction = []
+
+    def send_messages(self, email_messages):
+        self.in_transaction.append(connection.in_atomic_block)
+        writer = threading.Thread(target=self.write)
+        writer.start()
+        writer.join()
+        return super().send_messages(email_messages)
+
+    @staticmethod
+    def write():
+        try:
+            EmailOutbox.objects.create(
+                subject='Другое', body='', recipient='other@yamdb.fake'
+            )
+        finally:
+            connections.close_all()
+
+
+class CountingBackend(EmailBackend):
+
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15EmailOutbox:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+    DATA = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+
+    def test_01_worker_mode(self, client, settings):
+        settings.EMAIL_OUTBOX_MODE = 'worker'
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.SIGNUP_URL, data=self.DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что в режиме `worker` регистрация не отправляет '
+            'письмо сама.'
+        )
+        assert EmailOutbox.objects.filter(
+            recipient=self.DATA['email'], sent__isnull=True
+        ).exists(), (
+            'Проверьте, что при регистрации письмо попадает в очередь.'
+        )
+
+        call_command('send_outbox', '--once', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert not EmailOutbox.objects.filter(sent__isnull=True).exists(), (
+            'Проверьте, что команда `send_outbox` отправляет письма из '
+            'очереди и отмечает их отправленными.'
+        )
+
+    def test_02_retry_with_backoff(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_15_outbox.FailingBackend'
+        response = client.post(self.SIGNUP_URL, data=self.DATA)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ошибка отправки письма не ломает регистрацию.'
+        )
+        email = EmailOutbox.objects.get()
+        assert email.sent is None
+        assert email.attempts == 1
+        first_retry = email.send_after
+
+        assert send_pending() == (0, 0), (
+            'Проверьте, что письмо не отправляется повторно до истечения '
+            'задержки.'
+        )
+        EmailOutbox.objects.update(send_after=email.created)
+        assert send_pending() == (0, 1)
+        email.refresh_from_db()
+        assert email.attempts == 2
+        assert email.send_after - email.created > (
+            first_retry - email.created
+        ), 'Проверьте, что задержка растёт с каждой попыткой.'
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        EmailOutbox.objects.update(send_after=email.created)
+        assert send_pending() == (1, 0)
+
+    def test_03_connection_refused(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_15_outbox.RefusedBackend'
+        response = client.post(self.SIGNUP_URL, data=self.DATA)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что недоступный SMTP-сервер не ломает регистрацию.'
+        )
+        email = EmailOutbox.objects.get()
+        assert (email.sent, email.attempts) == (None, 1), (
+            'Проверьте, что отказ в соединении засчитывается как попытка '
+            'отправки с повтором позже.'
+        )
+        assert 'ConnectionRefusedError' in email.last_error
+
+        EmailOutbox.objects.update(send_after=email.created)
+        call_command('send_outbox', '--once', stdout=StringIO())
+        email.refresh_from_db()
+        assert email.attempts == 2, (
+            'Проверьте, что `send_outbox` не падает при отказе в соединении.'
+        )
+
+    def test_04_send_outside_transaction(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_15_outbox.ConcurrentWriteBackend'
+        ConcurrentWriteBackend.in_transaction.clear()
+        response = client.post(self.SIGNUP_URL, data=self.DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert ConcurrentWriteBackend.in_transaction == [False], (
+            'Проверьте, что письмо отправляется вне транзакции.'
+        )
+        email = EmailOutbox.objects.get(recipient=self.DATA['email'])
+        assert email.sent is not None and email.attempts == 1, (
+            'Проверьте, что отправка отмечается, даже если во время '
+            'отправки другое соединение писало в БД.'
+        )
+        assert EmailOutbox.objects.filter(
+            recipient='other@yamdb.fake', sent__isnull=True
+        ).exists()
+
+    def test_05_claimed_emails_are_leased(self, settings):
+        settings.EMAIL_OUTBOX_MODE = 'worker'
+        email = enqueue_email('Тема', 'Текст', self.DATA['email'])
+        claimed = EmailOutbox.objects.filter(pk=email.pk)
+        # Письмо забрал отправитель, который ещё не записал результат.
+        assert [row.pk for row in claim()] == [email.pk]
+        assert claim() == [], (
+            'Проверьте, что забранное письмо не видно другим отправителям.'
+        )
+        assert send_pending() == (0, 0)
+        claimed.update(send_after=email.created)
+        assert send_pending() == (1, 0), (
+            'Проверьте, что письмо возвращается в очередь, когда аренда '
+            'истекает.'
+        )
+        assert claimed.get().attempts == 2
+
+    def test_06_thread_mode_batches(self, settings):
+        settings.EMAIL_OUTBOX_MODE = 'thread'
+        settings.EMAIL_BACKEND = 'tests.test_15_outbox.CountingBackend'
+        CountingBackend.opened = 0
+        outbox_before_count = len(mail.outbox)
+        with transaction.atomic():
+            for number in range(3):
+                enqueue_email('Тема', 'Текст', f'user{number}@yamdb.fake')
+        deadline = time.monotonic() + 5
+        while (
+            EmailOutbox.objects.filter(sent__isnull=True).exists()
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.05)
+        assert not EmailOutbox.objects.filter(sent__isnull=True).exists(), (
+            'Проверьте, что в режиме `thread` письма отправляет фоновый '
+            'поток.'
+        )
+        assert len(mail.outbox) == outbox_before_count + 3
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что фоновый поток отправляет пачку писем через '
+            'одно соединение.'
+        )
@@ -0,0 +1,244 @@
+import csv
+import json
+import shutil
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+FILES = {
+    'category': Category,
+    'genre': Genre,
+    'titles': Title,
+    'genre_title': GenreTitle,
+    'users': User,
+    'review': Review,
+    'comments': Comment,
+}
+
+
+def csv_rows(name):
+    with open(DATA_DIR / f'{name}.csv', newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16CsvImport:
+
+    def test_01_import_all_files(self, tmp_path):
+        out = StringIO()
+        call_command(
+            'import_csv', '--chunk-size', '7', '--workers', '3',
+            '--state', str(tmp_path / 'state.json'), stdout=out
+        )
+        for name, model in FILES.items():
+            assert model.objects.count() == len(csv_rows(name)), (
+                f'Проверьте, что команда `import_csv` загружает все строки '
+                f'файла `{name}.csv`.'
+            )
+        assert 'строк/с' in out.getvalue()
+
+        row = csv_rows('review')[0]
+        review = Review.objects.get(pk=row['id'])
+        assert review.pub_date.isoformat().startswith(row['pub_date'][:19]), (
+            'Проверьте, что команда `import_csv` сохраняет дату публикации '
+            'из файла.'
+        )
+        title = Title.objects.get(pk=row['title_id'])
+        scores = [
+            int(item['score']) for item in csv_rows('review')
+            if item['title_id'] == row['title_id']
+        ]
+        assert title.rating_count == len(scores)
+        assert title.rating == sum(scores) / len(scores), (
+            'Проверьте, что после загрузки отзывов пересчитывается рейтинг '
+            'произведений.'
+        )
+
+    def test_02_dependency_order(self):
+        from reviews.csv_import import SPECS, dependency_order
+
+        order = [spec.name for spec in dependency_order(reversed(SPECS))]
+        for spec in SPECS:
+            for dependency in spec.depends_on:
+                assert order.index(dependency) < order.index(spec.name), (
+                    f'Проверьте, что файл `{dependency}.csv` загружается '
+                    f'раньше зависящего от него `{spec.name}.csv`.'
+                )
+
+    def test_03_invalid_file_is_not_loaded(self, tmp_path):
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\nдва,Книга,book\n',
+            encoding='utf-8'
+        )
+        with pytest.raises(CommandError, match='строка 3'):
+            call_command(
+                'import_csv', 'category', '--path', str(tmp_path),
+                '--workers', '1', stdout=StringIO()
+            )
+        assert not Category.objects.exists(), (
+            'Проверьте, что файл с ошибками не загружается в БД.'
+        )
+
+    def test_04_resume_interrupted_import(self, tmp_path, monkeypatch):
+        from reviews import csv_import
+
+        state = tmp_path / 'state.json'
+        options = ('--chunk-size', '7', '--workers', '1', '--state', state)
+        call_command(
+            'import_csv', 'category', 'genre', 'titles', 'users', *options,
+            stdout=StringIO()
+        )
+
+        # Имитируем сбой: третья пачка отзывов не сохраняется.
+        insert_chunk = csv_import.insert_chunk
+        calls = []
+
+        def failing_insert_chunk(spec, values, report):
+            calls.append(values)
+            if len(calls) == 3:
+                raise RuntimeError('сбой')
+            insert_chunk(spec, values, report)
+
+        monkeypatch.setattr(csv_import, 'insert_chunk', failing_insert_chunk)
+        with pytest.raises(RuntimeError):
+            call_command('import_csv', 'review', *options, stdout=StringIO())
+        assert Review.objects.count() == 14
+        monkeypatch.undo()
+
+        offsets = []
+        read_rows = csv_import.read_rows
+
+        def tracking_read_rows(path, offset=0):
+            offsets.append(offset)
+            return read_rows(path, offset)
+
+        monkeypatch.setattr(csv_import, 'read_rows', tracking_read_rows)
+        out = StringIO()
+        call_command('import_csv', 'review', *options, stdout=out)
+        assert Review.objects.count() == len(csv_rows('review')), (
+            'Проверьте, что прерванная загрузка продолжается с последней '
+            'контрольной точки.'
+        )
+        assert 'записано {}, обновлено 0, пропущено 14\n'.format(
+            len(csv_rows('review')) - 14
+        ) in out.getvalue(), (
+            'Проверьте, что уже загруженные пачки не записываются повторно.'
+        )
+        assert offsets and offsets[0] > 0, (
+            'Проверьте, что загрузка продолжается с сохранённого смещения, '
+            'а не с начала файла.'
+        )
+
+    def test_05_upsert_updates_changed_rows(self, tmp_path):
+        data = tmp_path / 'data'
+        shutil.copytree(DATA_DIR, data)
+        options = (
+            '--path', data, '--chunk-size', '7', '--workers', '1',
+            '--state', tmp_path / 'state.json'
+        )
+        call_command('import_csv', *options, stdout=StringIO())
+
+        rows = csv_rows('category')
+        rows[0]['name'] = 'Новое название'
+        with open(data / 'category.csv', 'w', newline='',
+                  encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+        out = StringIO()
+        call_command(
+            'import_csv', 'category', *options, '--mode', 'upsert', stdout=out
+        )
+        assert Category.objects.get(pk=rows[0]['id']).name == (
+            'Новое название'
+        ), 'Проверьте, что в режиме `upsert` изменённые строки обновляются.'
+        assert 'обновлено 1,' in out.getvalue(), (
+            'Проверьте, что в режиме `upsert` обновляются только '
+            'изменившиеся строки.'
+        )
+
+    def test_06_import_invalidates_responses(self, client, tmp_path):
+        url = '/api/v1/titles/'
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        cache.set('unrelated', 'value')
+
+        call_command(
+            'import_csv', 'category', 'genre', 'titles', '--workers', '1',
+            '--state', tmp_path / 'state.json', stdout=StringIO()
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 200, (
+            'Проверьте, что после загрузки `ETag` списка произведений '
+            'меняется.'
+        )
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == len(csv_rows('titles')), (
+            'Проверьте, что после загрузки API не отдаёт устаревший ответ '
+            'из кеша.'
+        )
+        assert cache.get('unrelated') == 'value', (
+            'Проверьте, что `import_csv` не очищает кеш целиком.'
+        )
+
+    def test_07_upsert_after_insert(self, tmp_path):
+        options = (
+            'category', '--chunk-size', '7', '--workers', '1',
+            '--state', tmp_path / 'state.json'
+        )
+        call_command('import_csv', *options, stdout=StringIO())
+        row = csv_rows('category')[0]
+        Category.objects.filter(pk=row['id']).update(name='Изменено')
+
+        out = StringIO()
+        call_command('import_csv', *options, '--mode', 'upsert', stdout=out)
+        assert Category.objects.get(pk=row['id']).name == row['name'], (
+            'Проверьте, что контрольная точка загрузки в режиме `insert` '
+            'не пропускает пачки в режиме `upsert`.'
+        )
+        assert 'обновлено 1, пропущено 0\n' in out.getvalue()
+
+    def test_08_existing_rows_are_not_counted(self, tmp_path):
+        options = ('category', '--workers', '1', '--restart')
+        call_command(
+            'import_csv', *options, '--state', tmp_path / 'first.json',
+            stdout=StringIO()
+        )
+        out = StringIO()
+        call_command(
+            'import_csv', *options, '--state', tmp_path / 'second.json',
+            stdout=out
+        )
+        assert 'записано 0,' in out.getvalue(), (
+            'Проверьте, что строки, которые уже есть в БД, не считаются '
+            'записанными.'
+        )
+
+    def test_09_file_is_parsed_once(self, tmp_path, monkeypatch):
+        from reviews import csv_import
+
+        reads = []
+        read_rows = csv_import.read_rows
+
+        def tracking_read_rows(path, offset=0):
+            reads.append(path)
+            return read_rows(path, offset)
+
+        monkeypatch.setattr(csv_import, 'read_rows', tracking_read_rows)
+        call_command(
+            'import_csv', 'category', '--workers', '1',
+            '--state', tmp_path / 'state.json', stdout=StringIO()
+        )
+        assert Category.objects.count() == len(csv_rows('category'))
+        assert len(reads) == 1, (
+            'Проверьте, что загрузка записывает строки, преобразованные '
+            'при проверке, и не разбирает файл второй раз.'
+        )
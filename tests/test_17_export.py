@@ -0,0 +1,114 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.test import override_settings
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Export:
+
+    EXPORT_URL = '/api/v1/export/{}'
+
+    @pytest.fixture
+    def catalogue(self, admin):
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        book = Category.objects.create(name='Книга', slug='book')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        titles = []
+        for number in range(5):
+            title = Title.objects.create(
+                name=f'Произведение {number}', year=2000 + number,
+                category=movie if number % 2 else book
+            )
+            title.genre.set([drama, comedy] if number % 2 else [drama])
+            review = Review.objects.create(
+                title=title, author=admin, text='Отзыв', score=number + 5
+            )
+            Comment.objects.create(review=review, author=admin, text='Ок')
+            titles.append(title)
+        return titles
+
+    def get(self, client, name, **params):
+        response = client.get(self.EXPORT_URL.format(name), params)
+        assert response.status_code == 200, (
+            f'Проверьте, что администратор может выгрузить `{name}`.'
+        )
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоковым ответом.'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_only_admin(self, client, user_client, catalogue):
+        url = self.EXPORT_URL.format('titles.ndjson')
+        assert client.get(url).status_code == 401
+        assert user_client.get(url).status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору.'
+        )
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_02_titles_ndjson(self, admin_client, catalogue):
+        rows = [
+            json.loads(line)
+            for line in self.get(admin_client, 'titles.ndjson').splitlines()
+        ]
+        assert [row['id'] for row in rows] == [
+            title.pk for title in catalogue
+        ], 'Проверьте, что выгрузка содержит все произведения.'
+        assert rows[1]['genre'] == ['comedy', 'drama']
+        assert rows[1]['category'] == 'movie'
+        assert rows[1]['rating'] == 6, (
+            'Проверьте, что выгрузка произведений содержит жанры, категорию '
+            'и рейтинг.'
+        )
+
+    def test_03_csv_with_title_filters(self, admin_client, catalogue):
+        rows = list(csv.DictReader(StringIO(
+            self.get(admin_client, 'titles.csv', genre='comedy')
+        )))
+        assert [int(row['id']) for row in rows] == [
+            catalogue[1].pk, catalogue[3].pk
+        ], 'Проверьте, что выгрузка принимает фильтры `TitleFilter`.'
+        assert rows[0]['genre'] == 'comedy,drama'
+
+        rows = list(csv.DictReader(StringIO(
+            self.get(admin_client, 'reviews.csv', year_min=2003)
+        )))
+        assert [int(row['title']) for row in rows] == [
+            catalogue[3].pk, catalogue[4].pk
+        ], (
+            'Проверьте, что отзывы выгружаются только для произведений, '
+            'подходящих под фильтры.'
+        )
+
+    def test_04_comments_and_unknown_resource(self, admin_client, catalogue):
+        lines = self.get(admin_client, 'comments.ndjson').splitlines()
+        assert len(lines) == len(catalogue)
+        assert json.loads(lines[0])['author'] == 'TestAdmin'
+        assert admin_client.get(
+            self.EXPORT_URL.format('users.csv')
+        ).status_code == 404
+        assert admin_client.get(
+            self.EXPORT_URL.format('titles.xml')
+        ).status_code == 404
+
+    def test_05_rating_matches_api(self, admin_client, user, catalogue):
+        title = catalogue[0]
+        Review.objects.create(title=title, author=user, text='Отзыв', score=6)
+        api_rating = admin_client.get(
+            f'/api/v1/titles/{title.pk}/'
+        ).json()['rating']
+        line = self.get(admin_client, 'titles.ndjson').splitlines()[0]
+        assert json.loads(line)['rating'] == api_rating
+        assert f'"rating": {api_rating},' in line, (
+            'Проверьте, что рейтинг в выгрузке целый, как в ответах API.'
+        )
+        rows = list(csv.DictReader(StringIO(
+            self.get(admin_client, 'titles.csv')
+        )))
+        assert rows[0]['rating'] == str(api_rating)
+        assert rows[1]['rating'] == '6'
@@ -0,0 +1,123 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18SparseFieldsets:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def title(self):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        title = Title.objects.create(
+            name='Терминатор', year=1984, category=category,
+            description='Описание'
+        )
+        title.genre.set([
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Боевик', slug='action'),
+        ])
+        return title
+
+    def test_01_fields(self, client, title):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, {'fields': 'id,name'})
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            {'id': title.id, 'name': title.name}
+        ], (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'reviews_genre' not in sql and 'description' not in sql, (
+            'Проверьте, что с параметром `fields` из БД не выбираются '
+            'ненужные колонки и не загружаются ненужные связи.'
+        )
+
+        response = client.get(
+            f'{self.TITLES_URL}{title.id}/', {'fields': 'name,genre'}
+        )
+        assert response.json() == {
+            'name': title.name,
+            'genre': [
+                {'name': 'Боевик', 'slug': 'action'},
+                {'name': 'Драма', 'slug': 'drama'},
+            ]
+        }
+
+    def test_02_expand(self, client, title):
+        data = client.get(
+            f'{self.TITLES_URL}{title.id}/', {'expand': ''}
+        ).json()
+        assert data['category'] == 'movie'
+        assert sorted(data['genre']) == ['action', 'drama'], (
+            'Проверьте, что связи, не перечисленные в `expand`, выводятся '
+            'своим slug.'
+        )
+        data = client.get(
+            f'{self.TITLES_URL}{title.id}/', {'expand': 'category'}
+        ).json()
+        assert data['category'] == {'name': 'Фильм', 'slug': 'movie'}, (
+            'Проверьте, что связи из `expand` выводятся вложенными объектами.'
+        )
+
+    def test_03_reviews_and_writes(self, admin_client, admin, title):
+        Review.objects.create(title=title, author=admin, text='text', score=7)
+        url = f'{self.TITLES_URL}{title.id}/reviews/'
+        data = admin_client.get(url, {'fields': 'score,author'}).json()
+        assert data['results'] == [{'score': 7, 'author': admin.username}], (
+            'Проверьте, что параметр `fields` работает для отзывов.'
+        )
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{title.id}/?fields=name', {'year': 1985}
+        )
+        assert response.status_code == 200
+        assert response.json()['year'] == 1985, (
+            'Проверьте, что параметр `fields` не влияет на запросы на '
+            'изменение.'
+        )
+
+    def test_04_related_fields_in_one_query(
+        self, client, django_user_model, title
+    ):
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'author{number}', email=f'author{number}@yamdb.fake'
+            )
+            for number in range(5)
+        ]
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='text', score=5
+            )
+            for author in authors
+        ]
+        for author in authors:
+            Comment.objects.create(
+                review=reviews[0], author=author, text='text'
+            )
+        urls = (
+            f'{self.TITLES_URL}{title.id}/reviews/',
+            f'{self.TITLES_URL}{title.id}/reviews/{reviews[0].id}/comments/',
+        )
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url, {'fields': 'id,author'})
+            assert response.status_code == 200
+            assert sorted(
+                item['author'] for item in response.json()['results']
+            ) == [author.username for author in authors]
+            user_queries = [
+                query['sql'] for query in context.captured_queries
+                if 'FROM "reviews_user"' in query['sql']
+            ]
+            assert not user_queries, (
+                'Проверьте, что с параметром `fields` авторы отзывов и '
+                'комментариев выбираются тем же запросом, что и сами '
+                'объекты.'
+            )
@@ -0,0 +1,85 @@
+import datetime
+from collections import OrderedDict
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONParser, FastJSONRenderer
+from reviews.models import Category, Genre, Title
+
+
+DATA = [
+    None,
+    [],
+    OrderedDict([('b', 1), ('a', [1, 2.5, True, None])]),
+    {'text': 'Привет, мир     "кавычки" \\ \n\t'},
+    {'date': datetime.datetime(
+        2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+    )},
+    {'day': datetime.date(2024, 1, 2), 'time': datetime.time(3, 4, 5)},
+    {'price': Decimal('1.10')},
+    {'big': 2 ** 70, 1: 'числовой ключ'},
+    {'rating': 7.333333333333333, 'count': 3},
+]
+
+
+class Test19Renderers:
+
+    @pytest.mark.parametrize('data', DATA)
+    def test_01_same_output(self, data):
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data
+        ), 'Проверьте, что FastJSONRenderer выдаёт те же байты, что и DRF.'
+
+    def test_02_indent_falls_back(self):
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(data, media_type) == (
+            JSONRenderer().render(data, media_type)
+        )
+
+    @pytest.mark.parametrize('body', [
+        b'{"a": [1, 2.5, null, true], "b": "\\u041f\\u0440\\u0438"}',
+        '{"текст": "привет"}'.encode(),
+        b'{"big": 123456789012345678901234567890}',
+    ], ids=['escapes', 'unicode', 'big-int'])
+    def test_03_same_parse(self, body):
+        assert FastJSONParser().parse(BytesIO(body)) == (
+            JSONParser().parse(BytesIO(body))
+        ), 'Проверьте, что FastJSONParser разбирает JSON так же, как DRF.'
+
+    @pytest.mark.parametrize(
+        'body', [b'{"a": NaN}', b'{"a": ', b'\xff'],
+        ids=['nan', 'truncated', 'not-utf8']
+    )
+    def test_04_invalid_body(self, body):
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(BytesIO(body))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_api_uses_fast_renderer(self, client, admin_client):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Терминатор', year=1984, category=category
+        )
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert isinstance(
+            response.accepted_renderer, FastJSONRenderer
+        ), 'Проверьте, что API использует FastJSONRenderer.'
+        response = admin_client.post(
+            '/api/v1/titles/',
+            data={
+                'name': 'Чужой', 'year': 1979, 'category': 'movie',
+                'genre': ['drama']
+            },
+            format='json'
+        )
+        assert response.status_code == 201
+        assert response.json()['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ]
@@ -0,0 +1,121 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.read_serializers import fast_read_serializer
+from api.serializers import (CommentSerializer, GetTitleSerializer,
+                             ReviewSerialiser)
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20FastReadSerializers:
+
+    @pytest.fixture
+    def titles(self, admin, user):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Боевик', slug='action'),
+        ]
+        rated = Title.objects.create(
+            name='Терминатор', year=1984, category=category,
+            description='Описание'
+        )
+        rated.genre.set(genres)
+        Title.objects.create(name='Без категории', year=2000)
+        review = Review.objects.create(
+            title=rated, author=admin, text='Отзыв', score=7
+        )
+        Review.objects.create(title=rated, author=user, text='Ещё', score=4)
+        Comment.objects.create(review=review, author=user, text='Согласен')
+        return Title.objects.order_by('id')
+
+    @pytest.mark.parametrize('serializer_class, queryset', [
+        (
+            GetTitleSerializer,
+            lambda: Title.objects.select_related('category')
+            .prefetch_related('genre').order_by('id')
+        ),
+        (ReviewSerialiser, lambda: Review.objects.order_by('id')),
+        (CommentSerializer, lambda: Comment.objects.order_by('id')),
+    ])
+    def test_01_same_output(self, titles, serializer_class, queryset):
+        fast_class = fast_read_serializer(serializer_class)
+        instances = list(queryset())
+        assert fast_class(instances, many=True).data == (
+            serializer_class(instances, many=True).data
+        ), (
+            'Проверьте, что быстрый сериализатор выдаёт те же данные, что '
+            f'и `{serializer_class.__name__}`.'
+        )
+        assert fast_class(instances[0]).data == (
+            serializer_class(instances[0]).data
+        )
+
+    def test_02_api_output(self, client, titles):
+        title = titles.first()
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.json() == GetTitleSerializer(title).data, (
+            'Проверьте, что ответ с быстрым сериализатором совпадает с '
+            'ответом `GetTitleSerializer`.'
+        )
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/', HTTP_ACCEPT='text/html'
+        )
+        assert response.status_code == 200
+
+    def test_03_current_timezone(self, titles):
+        review = Review.objects.first()
+        fast_class = fast_read_serializer(ReviewSerialiser)
+        with timezone.override('Europe/Moscow'):
+            assert fast_class(review).data == ReviewSerialiser(review).data, (
+                'Проверьте, что быстрый сериализатор переводит даты в '
+                'текущий часовой пояс так же, как DRF.'
+            )
+            assert fast_class(review).data['pub_date'].endswith('+03:00')
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        return len(context.captured_queries), response.json()['results']
+
+    def test_04_values_list(self, client, titles):
+        title = titles.first()
+        review = Review.objects.filter(title=title).first()
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        page = '?page_size=20'
+        comments_url = f'{reviews_url}{review.id}/comments/{page}'
+        reviews_url += page
+        # Первые запросы создают строки версий ресурсов.
+        client.get(reviews_url)
+        client.get(comments_url)
+        reviews_before, _ = self.count_queries(client, reviews_url)
+        comments_before, _ = self.count_queries(client, comments_url)
+        for idx in range(4):
+            author = User.objects.create_user(
+                username=f'reader{idx}', email=f'reader{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            Comment.objects.create(review=review, author=author, text='Да')
+
+        reviews_after, results = self.count_queries(client, reviews_url)
+        assert reviews_after == reviews_before, (
+            'Проверьте, что список отзывов выбирает авторов одним JOIN и '
+            'число запросов не зависит от числа авторов.'
+        )
+        assert results == ReviewSerialiser(
+            Review.objects.filter(title=title), many=True
+        ).data
+        comments_after, results = self.count_queries(client, comments_url)
+        assert comments_after == comments_before, (
+            'Проверьте, что список комментариев выбирает авторов одним JOIN '
+            'и число запросов не зависит от числа авторов.'
+        )
+        assert results == CommentSerializer(
+            Comment.objects.filter(review=review), many=True
+        ).data
@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from reviews.sqlite import apply_pragmas, get_profile, pragma_statements
+
+
+def read_pragma(cursor, name):
+    cursor.execute(f'PRAGMA {name}')
+    return cursor.fetchone()[0]
+
+
+class Test21SqliteProfile:
+
+    @pytest.mark.django_db
+    def test_01_connection_is_tuned(self, settings):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Профиль применяется только к SQLite.')
+        profile = settings.SQLITE_PROFILES['tuned']
+        with connection.cursor() as cursor:
+            assert read_pragma(cursor, 'busy_timeout') == (
+                profile['busy_timeout']
+            ), 'Проверьте, что прагмы профиля применяются к соединениям.'
+            assert read_pragma(cursor, 'cache_size') == profile['cache_size']
+            assert read_pragma(cursor, 'synchronous') == 1
+            assert read_pragma(cursor, 'temp_store') == 2
+
+    def test_02_file_database(self, tmp_path, settings):
+        database = sqlite3.connect(tmp_path / 'db.sqlite3')
+        try:
+            apply_pragmas(database, settings.SQLITE_PROFILES['tuned'])
+            cursor = database.cursor()
+            assert read_pragma(cursor, 'journal_mode') == 'wal', (
+                'Проверьте, что профиль `tuned` включает журнал WAL.'
+            )
+            assert read_pragma(cursor, 'mmap_size') == (
+                settings.SQLITE_PROFILES['tuned']['mmap_size']
+            )
+        finally:
+            database.close()
+
+    @pytest.mark.parametrize('profile', [
+        {'foreign_keys': 'ON'},
+        {'journal_mode': 'WAL; DROP TABLE reviews_title'},
+    ], ids=['unknown-pragma', 'bad-value'])
+    def test_03_invalid_profile(self, profile):
+        with pytest.raises(ImproperlyConfigured):
+            pragma_statements(profile)
+
+    def test_04_profile_setting(self, settings):
+        settings.SQLITE_PROFILE = 'default'
+        assert get_profile() == {}
+        settings.SQLITE_PROFILE = 'missing'
+        with pytest.raises(ImproperlyConfigured):
+            get_profile()